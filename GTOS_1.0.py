@@ -6,35 +6,486 @@ import subprocess
 import datetime
 import time
 import traceback
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 import logging
+import logging.handlers
+import queue
+import atexit
+from functools import lru_cache
 import random
 import calendar
 import hashlib
 import mimetypes
 import tempfile
-import textwrap
-import ctypes  # 新增导入
-
-try:
-    import readline
-except ImportError:
-    import pyreadline3 as readline
+import difflib
+import re
+import fnmatch
+import posixpath
+import errno
+import bisect
+import heapq
+import itertools
+import ast
+import math
+import mmap
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# 命令历史记录的最大条数
+_HISTORY_SIZE = 10000
+# 别名最多展开的层数
+_MAX_ALIAS_DEPTH = 8
+
+# 元数据缓存的容量和有效期（秒）；有效期用于兜底 GTOS 之外的文件修改
+_META_CACHE_SIZE = 10000
+_META_CACHE_TTL = 1.0
+# 计算哈希时每次交给 hashlib 的块大小，与 hashlib.file_digest 内部缓冲区一致
+_HASH_CHUNK = 1 << 18
+# cmp 每次比较的块大小
+_CMP_CHUNK = 1 << 20
+# grep 每次读取的块大小，以及判断模式是否为纯文本所用的正则元字符
+_GREP_CHUNK = 1 << 20
+_REGEX_META = frozenset('.^$*+?{}[]\\|()')
+# strings 要找的可打印 ASCII 序列（至少 4 个字符）
+_STRINGS_RE = re.compile(rb'[\x20-\x7e]{4,}')
+# tail 从文件末尾向前读取的初始块大小，行数不够时逐次翻倍
+_TAIL_CHUNK = 1 << 16
+# wc 统计字符数时要删除的字节：保留下来的都是 UTF-8 续字节（0x80-0xBF）
+_NON_CONTINUATION = bytes(b for b in range(256) if not 0x80 <= b <= 0xBF)
+# 批量输出时每次拼接写出的最大行数
+_WRITE_BATCH = 65536
+
+def _human_size(size: float) -> str:
+    for unit in ('', 'K', 'M', 'G', 'T', 'P'):
+        if size < 1024 or unit == 'P':
+            break
+        size /= 1024
+    if unit and size < 10:
+        return f"{size:.1f}{unit}"
+    return f"{size:.0f}{unit}"
+
+# 编译后的正则按模式缓存，重复执行 grep/find 时无需重新编译
+@lru_cache(maxsize=512)
+def _re(pattern, flags: int = 0):
+    return re.compile(pattern, flags)
+
+@lru_cache(maxsize=512)
+def _glob(pattern: str):
+    return re.compile(fnmatch.translate(pattern))
+
+# 当前目录与参数拼接的结果按 (目录, 名称) 缓存；键里已含目录，切换目录后旧条目自然不再命中
+_join_path = lru_cache(maxsize=256)(os.path.join)
+
+# expr/bc 只允许出现的语法节点：数值常量及算术、比较、逻辑运算
+_ARITH_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.BoolOp,
+                ast.Constant, ast.operator, ast.unaryop, ast.cmpop, ast.boolop)
+
+@lru_cache(maxsize=256)
+def _compile_expr(expr: str):
+    tree = ast.parse(expr, '<expr>', 'eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _ARITH_NODES) or (
+                isinstance(node, ast.Constant) and type(node.value) not in (int, float, complex)):
+            raise ValueError("只支持数值表达式")
+    return compile(tree, '<expr>', 'eval')
+
+def _fill(words: Iterable[str], width: int) -> Iterator[str]:
+    # 贪心填充：单词依次放入当前行，放不下时另起一行。
+    # 与 textwrap 一致，超过行宽的单词先填满当前行的剩余空间，其余部分按行宽截断
+    line: List[str] = []
+    length = -1
+    for word in words:
+        if len(word) > width:
+            if line:
+                room = width - length - 1
+                if room > 0:
+                    line.append(word[:room])
+                    word = word[room:]
+                yield ' '.join(line)
+                line, length = [], -1
+            while len(word) > width:
+                yield word[:width]
+                word = word[width:]
+        if length + 1 + len(word) > width:
+            yield ' '.join(line)
+            line, length = [word], len(word)
+        else:
+            line.append(word)
+            length += 1 + len(word)
+    if line:
+        yield ' '.join(line)
+
+def _write_lines(lines: Iterable[str]) -> None:
+    # 按块拼接后一次 write 输出，代替逐行 print；分块避免超大输出占满内存
+    write = sys.stdout.write
+    it = iter(lines)
+    while True:
+        block = list(itertools.islice(it, _WRITE_BATCH))
+        if not block:
+            break
+        block.append('')
+        write('\n'.join(block))
+
+# ul 用的转换表：给每个下划线加上 ANSI 下划线属性
+_UL_TABLE = str.maketrans({'_': '\033[4m_\033[0m'})
+
+def _copy_text(f, transform, whole_lines: bool = False) -> None:
+    # 按块读取文本、转换后直接写出，输出总以换行结尾。
+    # whole_lines 为 True 时每次只把完整的行交给 transform，供按行计算列位置的转换使用
+    write = sys.stdout.write
+    pending: List[str] = []
+    last = '\n'
+    for block in iter(lambda: f.read(1 << 20), ''):
+        if whole_lines:
+            cut = block.rfind('\n') + 1
+            if not cut:
+                pending.append(block)
+                continue
+            pending.append(block[:cut])
+            block, pending = ''.join(pending), [block[cut:]]
+        write(transform(block))
+        last = block[-1]
+    rest = ''.join(pending)
+    if rest:
+        write(transform(rest))
+        last = rest[-1]
+    if last != '\n':
+        write('\n')
+
+def _mmap_file(path: str):
+    # 只读映射整个文件，由操作系统按需换页；空文件无法映射，返回空 bytes。
+    # 返回值支持 len、切片、find/rfind，关闭文件后映射依然有效
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+# 行尾的一串 '\r'，连同其后的换行符
+_CR_EOL = re.compile(r'\r+\n')
+
+def _decode_lines(block: bytes) -> str:
+    # 按与 open_text 相同的方式解码一块行数据，并像 rstrip('\r\n') 那样去掉各行行尾的 '\r'
+    # （块本身不含最后一行的换行符，补上一个再去掉）
+    text = block.decode('utf-8', errors='replace')
+    if '\r' not in text:
+        return text
+    return _CR_EOL.sub('\n', text + '\n')[:-1]
+
+def _line_blocks(data, size: int = 1 << 20) -> Iterator[bytes]:
+    # 把数据切成约 size 字节的块，每块止于换行符（不含该换行符）；末尾的换行符不产生额外的空行
+    total = len(data)
+    if not total:
+        return
+    if data[total - 1:total] == b'\n':
+        total -= 1
+    start = 0
+    while True:
+        nl = data.find(b'\n', start + size, total) if start + size < total else -1
+        if nl < 0:
+            yield data[start:total]
+            return
+        yield data[start:nl]
+        start = nl + 1
+
+def _reverse_line_blocks(data, size: int = 1 << 20) -> Iterator[bytes]:
+    # 与 _line_blocks 的切块规则相同，但从末尾向前用 rfind 定位块边界，逆序产出各块
+    end = len(data)
+    if not end:
+        return
+    if data[end - 1:end] == b'\n':
+        end -= 1
+    while True:
+        nl = data.rfind(b'\n', 0, end - size) if end > size else -1
+        yield data[nl + 1:end]
+        if nl < 0:
+            return
+        end = nl
+
+def _first_difference(a: bytes, b: bytes, n: int) -> int:
+    # a[:n] 与 b[:n] 已知不同；对前缀做二分，每一步都是 C 层的整段比较
+    a, b = memoryview(a), memoryview(b)
+    lo, hi = 0, n
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+# od/hexdump 右侧字符栏的转换表：可打印 ASCII 保持原样，其余字节显示为 '.'
+_PRINTABLE = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+
+def _hex_rows(data, fmt: str) -> Iterator[str]:
+    # 每行 16 字节，fmt 依次接收偏移量、十六进制列和字符栏
+    for i in range(0, len(data), 16):
+        chunk = bytes(data[i:i + 16])
+        yield fmt.format(i, chunk.hex(' '), chunk.translate(_PRINTABLE).decode('ascii'))
+
+# 每个字节按位反转的转换表
+_BIT_REVERSE = bytes(int(f'{b:08b}'[::-1], 2) for b in range(256))
+
+def _posix_cksum(data) -> int:
+    # POSIX cksum 使用非反射的 CRC-32（多项式 0x04C11DB7，并在数据后追加长度）。
+    # zlib.crc32 是同一多项式的反射版本：把输入字节按位反转后交给 zlib，
+    # 再把结果寄存器整体反转，即可在 C 层完成全部计算
+    crc = 0xFFFFFFFF  # 使 zlib 内部寄存器从 0 开始
+    for off in range(0, len(data), 1 << 20):
+        crc = zlib.crc32(bytes(data[off:off + (1 << 20)]).translate(_BIT_REVERSE), crc)
+    length = len(data)
+    tail = bytearray()
+    while length:
+        tail.append(length & 0xFF)
+        length >>= 8
+    crc = zlib.crc32(bytes(tail).translate(_BIT_REVERSE), crc)
+    return ~int(f'{crc ^ 0xFFFFFFFF:032b}'[::-1], 2) & 0xFFFFFFFF
+
+# copy_file_range 不可用时（跨文件系统、内核或文件系统不支持）退回用户态复制
+_COPY_FALLBACK_ERRNOS = frozenset({errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL, errno.EBADF})
+# 只有 Linux 的 sendfile 能写入普通文件；macOS/BSD 上目标必须是套接字（与 shutil 的判断相同）
+_USE_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+
+def _copy_data(fsrc, fdst):
+    copied = 0
+    if hasattr(os, 'copy_file_range'):
+        # 数据在内核中直接搬运；支持 reflink 的文件系统上只需共享数据块
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if not sent:
+                    break
+                copied += sent
+                remaining -= sent
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+    # 复制剩余部分（若文件在复制期间变长，这里也会一并补齐）
+    fsrc.seek(copied)
+    fdst.seek(copied)
+    shutil.copyfileobj(fsrc, fdst, 1 << 20)
+
+def _copy_range(fsrc, fdst, offset: int, count: int) -> None:
+    # 把 fsrc 中从 offset 开始的 count 字节写到 fdst 的当前位置；Linux 上优先用 sendfile 在内核中完成
+    if _USE_SENDFILE:
+        try:
+            while count > 0:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, count)
+                if not sent:
+                    return
+                offset += sent
+                count -= sent
+            return
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+    # 退回用户态复制：复用同一个缓冲区，不为每块分配新的 bytes
+    fsrc.seek(offset)
+    buf = memoryview(bytearray(min(count, 1 << 20)))
+    while count > 0:
+        n = fsrc.readinto(buf[:count])
+        if not n:
+            break
+        fdst.write(buf[:n])
+        count -= n
+
+# Miller-Rabin 所用的底：取前 12 个素数时，对 3.3e24 以下的整数结论是确定的
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+# factor 先试除到这个界限，剩下的大因子交给 Pollard-rho
+_TRIAL_LIMIT = 1 << 12
+
+def _is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, r = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        r += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _pollard_rho(n: int) -> int:
+    # 返回奇合数 n 的一个非平凡因子；若某个常数 c 失败则换下一个
+    for c in itertools.count(1):
+        x = y = 2
+        d = 1
+        while d == 1:
+            x = (x * x + c) % n
+            y = (y * y + c) % n
+            y = (y * y + c) % n
+            d = math.gcd(x - y, n)
+        if d != n:
+            return d
+
+def _prime_factors(n: int) -> Dict[int, int]:
+    factors: Dict[int, int] = {}
+    for p in itertools.chain((2,), range(3, _TRIAL_LIMIT, 2)):
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if _is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollard_rho(m)
+            stack += (d, m // d)
+    return factors
+
+def _divisors(n: int) -> List[int]:
+    # 由素因子分解组合出全部约数，不再逐个试除到 sqrt(n)
+    divisors = [1]
+    for p, k in _prime_factors(n).items():
+        divisors = [d * p ** e for d in divisors for e in range(k + 1)]
+    return sorted(divisors)
+
+# cal 共用的日历实例；同一年份的排版结果不会变化，直接缓存
+_TC = calendar.TextCalendar()
+
+@lru_cache(maxsize=16)
+def _year_cal(year: int) -> str:
+    return _TC.formatyear(year)
+
+def _csr_graph(tokens: List[str]):
+    # 把节点名映射为按首次出现顺序编号的整数，再把边表整理成 CSR 结构：
+    # 节点 u 的后继是 indices[indptr[u]:indptr[u + 1]]，保持输入中的边序
+    name2id: Dict[str, int] = {}
+    ids = [name2id.setdefault(token, len(name2id)) for token in tokens]
+    n = len(name2id)
+    # 形如 "a a" 的一对只声明节点，不构成边
+    edges = [(u, v) for u, v in zip(ids[0::2], ids[1::2]) if u != v]
+    counts = [0] * (n + 1)
+    indeg = [0] * n
+    for u, v in edges:
+        counts[u + 1] += 1
+        indeg[v] += 1
+    indptr = array('l', itertools.accumulate(counts))
+    indices = array('l', bytes(len(edges) * array('l').itemsize))
+    fill = list(indptr[:-1])
+    for u, v in edges:
+        indices[fill[u]] = v
+        fill[u] += 1
+    return list(name2id), indptr, indices, indeg
+
+def _find_cycle(indptr, indices, indeg: List[int]) -> List[int]:
+    # 在尚未输出的节点（入度仍大于 0）中用迭代的三色 DFS 找出一个环。
+    # color 为 0 表示白色，1 为灰色（在当前路径上），2 为黑色（已查完）；
+    # indices 中为 -1 的槽位是已被打断的边，跳过
+    color = [0] * len(indeg)
+    for root in range(len(indeg)):
+        if indeg[root] <= 0 or color[root]:
+            continue
+        color[root] = 1
+        path = [root]
+        stack = [iter(indices[indptr[root]:indptr[root + 1]])]
+        while stack:
+            for v in stack[-1]:
+                if v < 0 or indeg[v] <= 0:
+                    continue
+                if color[v] == 1:
+                    return path[path.index(v):]
+                if not color[v]:
+                    color[v] = 1
+                    path.append(v)
+                    stack.append(iter(indices[indptr[v]:indptr[v + 1]]))
+                    break
+            else:
+                color[path.pop()] = 2
+                stack.pop()
+    return []
+
+# 设置窗口标题的实现在导入时按平台选定，调用时不再判断 os.name
+if os.name == 'nt':  # Windows
+    import ctypes
+    _set_title = ctypes.windll.kernel32.SetConsoleTitleW
+    _set_title.argtypes = [ctypes.c_wchar_p]
+    _set_title.restype = ctypes.c_int
+elif os.name == 'posix':  # Unix/Linux/Mac
+    def _set_title(title: str):
+        sys.stdout.write(f"\x1b]2;{title}\x07")
+        sys.stdout.flush()
+else:
+    def _set_title(title: str):
+        pass
 
 class FileSystem:
     def __init__(self, root_dir: str):
         self.root_dir = root_dir
+        self._meta_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
 
     def _full_path(self, path: str) -> str:
         return os.path.join(self.root_dir, path.lstrip('/'))
 
-    def list_dir(self, path: str) -> List[str]:
+    def _cached_meta(self, kind: str, full_path: str, func):
+        key = (kind, full_path)
+        now = time.monotonic()
+        cached = self._meta_cache.get(key)
+        if cached is not None and now - cached[0] < _META_CACHE_TTL:
+            self._meta_cache.move_to_end(key)
+            return cached[1]
+        try:
+            result = func(full_path)
+        except FileNotFoundError:
+            result = None  # 负缓存：记录不存在的路径
+        self._meta_cache[key] = (now, result)
+        self._meta_cache.move_to_end(key)
+        if len(self._meta_cache) > _META_CACHE_SIZE:
+            self._meta_cache.popitem(last=False)
+        return result
+
+    def _invalidate(self, *full_paths: str):
+        for full_path in full_paths:
+            full_path = full_path.rstrip(os.sep) or os.sep
+            for target in (full_path, os.path.dirname(full_path)):
+                self._meta_cache.pop(('stat', target), None)
+                self._meta_cache.pop(('readlink', target), None)
+
+    def stat(self, path: str) -> os.stat_result:
+        result = self._cached_meta('stat', self._full_path(path), os.stat)
+        if result is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        return result
+
+    def is_dir(self, path: str) -> bool:
+        try:
+            result = self._cached_meta('stat', self._full_path(path), os.stat)
+        except OSError:
+            return False
+        return result is not None and stat.S_ISDIR(result.st_mode)
+
+    def read_link(self, path: str) -> str:
+        result = self._cached_meta('readlink', self._full_path(path), os.readlink)
+        if result is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        return result
+
+    def list_dir(self, path: str) -> List[os.DirEntry]:
+        # DirEntry 缓存了读目录时得到的类型信息，entry.stat() 按需获取元数据；
+        # 在 with 块内取完全部条目，目录句柄不会泄漏给调用方
         full_path = self._full_path(path)
-        return os.listdir(full_path)
+        with os.scandir(full_path) as it:
+            return list(it)
 
     def change_dir(self, path: str) -> bool:
         full_path = self._full_path(path)
-        if os.path.isdir(full_path):
+        if self.is_dir(path):
             os.chdir(full_path)
             return True
         return False
@@ -43,6 +494,7 @@ class FileSystem:
         full_path = self._full_path(path)
         try:
             os.makedirs(full_path, exist_ok=True)
+            self._invalidate(full_path)
             return True
         except OSError as e:
             logging.error(f"无法创建目录 '{path}': {e}")
@@ -52,6 +504,7 @@ class FileSystem:
         full_path = self._full_path(path)
         try:
             os.remove(full_path)
+            self._invalidate(full_path)
             return True
         except OSError as e:
             logging.error(f"无法删除文件 '{path}': {e}")
@@ -61,7 +514,15 @@ class FileSystem:
         src_path = self._full_path(src)
         dst_path = self._full_path(dst)
         try:
-            shutil.copy2(src_path, dst_path)
+            if os.path.isdir(dst_path):
+                dst_path = os.path.join(dst_path, os.path.basename(src_path))
+            # 以 'wb' 打开目标会先清空文件：目标与源是同一文件（含符号链接）时必须在此之前拒绝
+            if os.path.exists(dst_path) and os.path.samefile(src_path, dst_path):
+                raise shutil.SameFileError(f"'{src_path}' 和 '{dst_path}' 是同一个文件")
+            with open(src_path, 'rb', buffering=0) as fsrc, open(dst_path, 'wb', buffering=0) as fdst:
+                _copy_data(fsrc, fdst)
+            shutil.copystat(src_path, dst_path)
+            self._invalidate(dst_path)
             return True
         except OSError as e:
             logging.error(f"无法复制文件 '{src}' 到 '{dst}': {e}")
@@ -72,6 +533,7 @@ class FileSystem:
         dst_path = self._full_path(dst)
         try:
             shutil.move(src_path, dst_path)
+            self._invalidate(src_path, dst_path)
             return True
         except OSError as e:
             logging.error(f"无法移动文件 '{src}' 到 '{dst}': {e}")
@@ -82,25 +544,119 @@ class FileSystem:
         try:
             with open(full_path, 'w') as f:
                 pass
+            self._invalidate(full_path)
             return True
         except OSError as e:
             logging.error(f"无法创建文件 '{path}': {e}")
             return False
 
+    def open_text(self, path: str):
+        # 所有文本读取都经由这里：统一按 UTF-8 解码（无法解码的字节替换掉），'\r\n' 转换为 '\n'，
+        # 1 MiB 缓冲区减少解码器调用次数
+        return open(self._full_path(path), 'r', encoding='utf-8', errors='replace', buffering=1 << 20)
+
     def read_file(self, path: str) -> str:
-        full_path = self._full_path(path)
         try:
-            with open(full_path, 'r') as f:
+            with self.open_text(path) as f:
                 return f.read()
         except OSError as e:
             logging.error(f"无法读取文件 '{path}': {e}")
             return ""
 
+    def read_lines(self, path: str, start: int = 0, stop: int = None) -> List[str]:
+        # 返回 [start, stop) 范围内的行，不含换行符；head 只读到第 stop 行为止
+        with self.open_text(path) as f:
+            if not start and stop is None:
+                # 整个文件一次读入，再在 C 层按行切分，比逐行构造对象更快。
+                # 只按 '\n' 切分（与逐行迭代一致）；splitlines 还会在 '\f'、'\x1c' 等字符处断行
+                lines = f.read().split('\n')
+                if not lines[-1]:
+                    lines.pop()
+                return lines
+            return [line.rstrip('\n') for line in itertools.islice(f, start, stop)]
+
+    def tail_lines(self, path: str, count: int) -> List[str]:
+        # 从文件末尾向前读取，只读入包含最后 count 行的区域
+        with open(self._full_path(path), 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            chunk = min(size, _TAIL_CHUNK)
+            while True:
+                f.seek(size - chunk)
+                data = f.read(chunk)
+                # 需要多一个换行符才能确定第一行是完整的
+                if chunk == size or data.count(b'\n') > count:
+                    break
+                chunk = min(size, chunk * 2)
+        lines = data.splitlines()
+        if chunk < size:
+            lines = lines[1:]
+        # 解码方式与 open_text 一致
+        return [line.decode('utf-8', errors='replace') for line in lines[-count:]] if count else []
+
+    def count_lines(self, path: str) -> int:
+        # 复用同一个缓冲区，换行符计数在 C 层完成，不做文本解码
+        buf = bytearray(1 << 20)
+        lines = 0
+        last = ord('\n')
+        with open(self._full_path(path), 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                lines += buf.count(b'\n', 0, n)
+                last = buf[n - 1]
+        # 末尾没有换行符的最后一行也算一行
+        return lines + (last != ord('\n'))
+
+    def word_count(self, path: str) -> tuple:
+        # 单遍分块统计行数、单词数和字符数，不把整个文件读入内存
+        lines = words = chars = 0
+        last = b'\n'
+        with open(self._full_path(path), 'rb') as f:
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    break
+                lines += chunk.count(b'\n')
+                words += len(chunk.split())
+                # 单词跨越块边界时会被计两次
+                if not last.isspace() and not chunk[:1].isspace():
+                    words -= 1
+                # 字符数 = 字节数 - UTF-8 续字节数
+                chars += len(chunk) - len(chunk.translate(None, _NON_CONTINUATION))
+                last = chunk[-1:]
+        if last != b'\n':
+            lines += 1
+        return lines, words, chars
+
+    def read_bytes(self, path: str) -> bytes:
+        # 以二进制读取，不做解码；调用方（sum/cksum/od/hexdump/strings）都要遍历整个文件，直接一次读入
+        with open(self._full_path(path), 'rb') as f:
+            return f.read()
+
+    def hash_file(self, path: str, algo: str) -> str:
+        full_path = self._full_path(path)
+        with open(full_path, 'rb', buffering=0) as f:
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, algo).hexdigest()
+            h = hashlib.new(algo)
+            if os.fstat(f.fileno()).st_size:
+                # 旧版 Python 没有 file_digest，用 mmap 直接把页缓存交给 hashlib
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    mv = memoryview(mm)
+                    try:
+                        for off in range(0, len(mv), _HASH_CHUNK):
+                            h.update(mv[off:off + _HASH_CHUNK])
+                    finally:
+                        mv.release()
+            return h.hexdigest()
+
     def write_file(self, path: str, content: str) -> bool:
         full_path = self._full_path(path)
         try:
-            with open(full_path, 'w') as f:
+            with open(full_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            self._invalidate(full_path)
             return True
         except OSError as e:
             logging.error(f"无法写入文件 '{path}': {e}")
@@ -110,6 +666,7 @@ class FileSystem:
         full_path = self._full_path(path)
         try:
             shutil.rmtree(full_path)
+            self._invalidate(full_path)
             return True
         except OSError as e:
             logging.error(f"无法删除目录 '{path}': {e}")
@@ -120,15 +677,52 @@ class FileSystem:
         link_path = self._full_path(link_name)
         try:
             os.symlink(target_path, link_path)
+            self._invalidate(link_path)
             return True
         except OSError as e:
             logging.error(f"无法创建符号链接 '{link_name}' 指向 '{target}': {e}")
             return False
 
+    def create_hardlink(self, src: str, dst: str) -> bool:
+        src_path = self._full_path(src)
+        dst_path = self._full_path(dst)
+        try:
+            os.link(src_path, dst_path)
+            self._invalidate(src_path, dst_path)
+            return True
+        except OSError as e:
+            logging.error(f"无法创建硬链接 '{dst}' 指向 '{src}': {e}")
+            return False
+
+    def truncate_file(self, path: str, size: int) -> bool:
+        full_path = self._full_path(path)
+        try:
+            os.truncate(full_path, size)
+            self._invalidate(full_path)
+            return True
+        except OSError as e:
+            logging.error(f"无法截断文件 '{path}': {e}")
+            return False
+
+    def open_write(self, path: str):
+        # 以二进制写方式打开（创建）文件；打开前清除该路径及其父目录的元数据缓存，
+        # 之后的 stat 会重新读取，不会看到旧的大小或"不存在"的负缓存
+        full_path = self._full_path(path)
+        self._invalidate(full_path)
+        return open(full_path, 'wb')
+
+    def make_temp(self, prefix: str) -> str:
+        # 在系统临时目录中创建空文件并返回其路径；文件描述符立即关闭
+        fd, temp_path = tempfile.mkstemp(prefix=prefix)
+        os.close(fd)
+        self._invalidate(temp_path)
+        return temp_path
+
     def change_mode(self, path: str, mode: int) -> bool:
         full_path = self._full_path(path)
         try:
             os.chmod(full_path, mode)
+            self._invalidate(full_path)
             return True
         except OSError as e:
             logging.error(f"无法更改文件 '{path}' 的模式: {e}")
@@ -138,6 +732,7 @@ class FileSystem:
         full_path = self._full_path(path)
         try:
             os.chown(full_path, uid, gid)
+            self._invalidate(full_path)
             return True
         except OSError as e:
             logging.error(f"无法更改文件 '{path}' 的所有者: {e}")
@@ -145,37 +740,341 @@ class FileSystem:
 
     def disk_free(self) -> str:
         try:
-            result = subprocess.run(['df', '-h'], capture_output=True, text=True, check=True)
-            return result.stdout
-        except subprocess.CalledProcessError as e:
+            usage = shutil.disk_usage(self.root_dir)
+        except OSError as e:
             logging.error(f"无法获取磁盘使用信息: {e}")
             return ""
+        mount = os.path.abspath(self.root_dir)
+        while not os.path.ismount(mount) and os.path.dirname(mount) != mount:
+            mount = os.path.dirname(mount)
+        # 与 df 相同，使用率按 used / (used + avail) 向上取整
+        capacity = usage.used + usage.free
+        percent = -(-usage.used * 100 // capacity) if capacity else 0
+        return (f"{'Size':>6} {'Used':>6} {'Avail':>6} {'Use%':>5} Mounted on\n"
+                f"{_human_size(usage.total):>6} {_human_size(usage.used):>6} "
+                f"{_human_size(usage.free):>6} {percent:>4}% {mount}")
 
     def disk_usage(self, path: str) -> str:
         full_path = self._full_path(path)
         try:
-            result = subprocess.run(['du', '-sh', full_path], capture_output=True, text=True, check=True)
-            return result.stdout.split('\t')[0]
-        except subprocess.CalledProcessError as e:
+            st = os.stat(full_path, follow_symlinks=False)
+        except OSError as e:
             logging.error(f"无法获取磁盘使用信息: {e}")
             return ""
+        # 与 du 一致按实际占用的块统计；没有 st_blocks 的平台退回文件大小
+        use_blocks = hasattr(st, 'st_blocks')
+        total = st.st_blocks * 512 if use_blocks else st.st_size
+        stack = [full_path] if stat.S_ISDIR(st.st_mode) else []
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        entry_stat = entry.stat(follow_symlinks=False)
+                        total += entry_stat.st_blocks * 512 if use_blocks else entry_stat.st_size
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError as e:
+                logging.error(f"无法获取磁盘使用信息: {e}")
+        return _human_size(total)
+
+    def _scan_dir(self, directory: str, match) -> tuple:
+        matches, subdirs = [], []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if match(entry.name):
+                        matches.append(entry.path)
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+        except OSError as e:
+            logging.error(f"无法找到文件: {e}")
+        return matches, subdirs
 
     def find_files(self, path: str, pattern: str) -> List[str]:
         full_path = self._full_path(path)
+        match = _glob(pattern).match
+        results = []
+        if match(os.path.basename(full_path.rstrip(os.sep))):
+            results.append(full_path)
+        # 每个子目录作为独立任务提交；scandir 期间会释放 GIL，线程可以并行
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            pending = {executor.submit(self._scan_dir, full_path, match)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    matches, subdirs = future.result()
+                    results.extend(matches)
+                    pending.update(executor.submit(self._scan_dir, d, match) for d in subdirs)
+        results.sort()
+        return results
+
+    def _grep_file(self, find, verify, path: str) -> List[str]:
+        hits = []
+        lineno = 1
+        carry = b''
         try:
-            result = subprocess.run(['find', full_path, '-name', pattern], capture_output=True, text=True, check=True)
-            return result.stdout.splitlines()
-        except subprocess.CalledProcessError as e:
-            logging.error(f"无法找到文件: {e}")
-            return []
+            with open(self._full_path(path), 'rb') as f:
+                while True:
+                    chunk = f.read(_GREP_CHUNK)
+                    if chunk:
+                        chunk = carry + chunk
+                        cut = chunk.rfind(b'\n') + 1
+                        if not cut:
+                            carry = chunk
+                            continue
+                        block, carry = chunk[:cut], chunk[cut:]
+                    else:
+                        block, carry = carry, b''
+                    # 在整块上搜索，只在命中时才定位所在行
+                    pos = counted = 0
+                    while pos < len(block):
+                        hit = find(block, pos)
+                        # 块末尾换行符之后的零宽匹配属于下一块，不在本块内
+                        if hit < 0 or hit == len(block) and block.endswith(b'\n'):
+                            break
+                        start = block.rfind(b'\n', 0, hit) + 1
+                        end = block.find(b'\n', start)
+                        if end < 0:
+                            end = len(block)
+                        line = block[start:end]
+                        if verify is None or verify(line):
+                            lineno += block.count(b'\n', counted, start)
+                            counted = start
+                            hits.append(f"{path}:{lineno}:{line.decode(errors='replace')}")
+                        pos = end + 1
+                    lineno += block.count(b'\n', counted)
+                    if not chunk:
+                        break
+        except OSError as e:
+            logging.error(f"无法读取文件 '{path}': {e}")
+        return hits
 
     def grep_files(self, pattern: str, files: List[str]) -> List[str]:
-        try:
-            result = subprocess.run(['grep', '-nH', pattern] + files, capture_output=True, text=True, check=True)
-            return result.stdout.splitlines()
-        except subprocess.CalledProcessError as e:
-            logging.error(f"未找到匹配项: {e}")
-            return []
+        needle = pattern.encode()
+        if _REGEX_META.isdisjoint(pattern):
+            # 纯文本模式直接用 bytes.find，不经过正则引擎
+            find = lambda block, pos: block.find(needle, pos)
+            verify = None
+        else:
+            try:
+                regex = _re(needle, re.MULTILINE)
+            except re.error as e:
+                logging.error(f"无效的模式 '{pattern}': {e}")
+                return []
+            def find(block, pos):
+                m = regex.search(block, pos)
+                return m.start() if m else -1
+            # 跨行的匹配不算命中，需要在单行内再确认一次
+            verify = regex.search
+        # 线程数同时限制了打开的文件描述符数量；map 保持文件顺序
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = [hit for hits in executor.map(lambda f: self._grep_file(find, verify, f), files) for hit in hits]
+        if not results:
+            logging.error(f"未找到匹配项: {pattern}")
+        return results
+
+_HELP_TEXT: Dict[str, str] = {
+    'about': "显示关于GTOS的信息",
+    'alias': "创建命令别名",
+    'awk': "模式扫描和处理语言",
+    'basename': "返回文件路径的基本名称",
+    'bc': "基本计算器语言",
+    'cal': "显示日历",
+    'cat': "显示文件内容",
+    'cd': "更改当前工作目录",
+    'chmod': "更改文件模式",
+    'chown': "更改文件所有者",
+    'cksum': "计算文件的校验和",
+    'clear': "清除屏幕上的输出",
+    'cmp': "比较文件的字节",
+    'col': "过滤控制字符",
+    'colrm': "删除列",
+    'column': "格式化表格输出",
+    'comm': "比较两个排序文件",
+    'cp': "复制文件",
+    'csplit': "根据模式分割文件",
+    'cut': "从文件中提取指定列",
+    'date': "显示或设置系统日期和时间",
+    'df': "显示磁盘空间使用情况",
+    'diff': "比较文件差异",
+    'dirname': "返回文件路径的目录部分",
+    'du': "显示目录或文件的磁盘使用情况",
+    'echo': "输出文本到标准输出",
+    'env': "显示环境变量",
+    'expand': "将制表符转换为空格",
+    'expr': "计算表达式",
+    'factor': "分解数字",
+    'file': "确定文件类型",
+    'find': "在文件系统中查找文件",
+    'fmt': "简单文本格式化",
+    'fold': "限制行宽度",
+    'grep': "在文件中搜索文本模式",
+    'head': "显示文件的前几行",
+    'hexdump': "以十六进制格式转储文件内容",
+    'history': "显示命令历史记录",
+    'join': "根据指定字段连接文件",
+    'kill': "模拟终止进程",
+    'link': "创建硬链接",
+    'ln': "创建符号链接",
+    'ls': "列出当前目录中的文件",
+    'man': "显示命令手册",
+    'md5sum': "计算文件的MD5校验和",
+    'mime': "确定文件的MIME类型",
+    'mkdir': "创建一个新目录",
+    'mktemp': "创建临时文件或目录",
+    'mv': "移动或重命名文件",
+    'nl': "为文件添加行号",
+    'numfmt': "格式化数字",
+    'od': "转储文件内容",
+    'paste': "合并文件",
+    'patch': "应用补丁文件",
+    'pathchk': "检查文件名是否有效",
+    'pr': "格式化并打印文本文件",
+    'printf': "格式化输出文本",
+    'ps': "模拟显示当前运行的进程",
+    'pwd': "显示当前工作目录",
+    'readlink': "读取符号链接的内容",
+    'realpath': "返回文件的绝对路径",
+    'rev': "反转行",
+    'rm': "删除一个文件",
+    'rmdir': "删除一个空目录",
+    'sed': "流编辑器",
+    'seq': "生成序列",
+    'sha1sum': "计算文件的SHA1校验和",
+    'sha256sum': "计算文件的SHA256校验和",
+    'shuf': "随机排列行",
+    'sleep': "暂停执行一段时间",
+    'sort': "对文件内容进行排序",
+    'split': "分割文件",
+    'stat': "显示文件或文件系统状态",
+    'strings': "从文件中提取可打印字符串",
+    'sum': "计算文件的校验和",
+    'tac': "反向显示文件内容",
+    'tail': "显示文件的最后几行",
+    'test': "测试文件或字符串",
+    'time': "测量命令执行时间",
+    'top': "模拟显示系统资源使用情况",
+    'touch': "创建空文件或更新文件时间",
+    'tr': "转换或删除字符",
+    'truncate': "截断文件或扩展文件",
+    'tsort': "拓扑排序",
+    'ul': "下划线文本",
+    'unalias': "删除命令别名",
+    'uname': "显示系统信息",
+    'unexpand': "将空格转换为制表符",
+    'uniq': "去除文件中的重复行",
+    'unlink': "删除文件",
+    'uptime': "显示系统运行时间",
+    'watch': "周期性执行命令并显示输出",
+    'wc': "统计文件的行数、单词数和字符数",
+    'whereis': "查找命令的二进制文件、源代码和手册页的路径",
+    'which': "查找命令的路径",
+    'whoami': "显示当前用户的登录名",
+    'yes': "输出字符串直到被中断"
+}
+
+_MAN_PAGES: Dict[str, str] = {
+    'about': "显示关于GTOS的信息。用法：about",
+    'alias': "创建命令别名。用法：alias <别名> <命令>",
+    'awk': "模式扫描和处理语言。用法：awk '<脚本>' <文件>",
+    'basename': "返回文件路径的基本名称。用法：basename <文件>",
+    'bc': "基本计算器语言。用法：bc <表达式>",
+    'cal': "显示日历。用法：cal [年份]",
+    'cat': "显示文件内容。用法：cat <文件>",
+    'cd': "更改当前工作目录。用法：cd <目录>",
+    'chmod': "更改文件模式。用法：chmod <模式> <文件>",
+    'chown': "更改文件所有者。用法：chown <uid> <gid> <文件>",
+    'cksum': "计算文件的校验和。用法：cksum <文件>",
+    'clear': "清除屏幕上的输出。用法：clear",
+    'cmp': "比较文件的字节。用法：cmp <文件1> <文件2>",
+    'col': "过滤控制字符。用法：col <文件>",
+    'colrm': "删除列。用法：colrm <文件> <开始列> <结束列>",
+    'column': "格式化表格输出。用法：column <文件>",
+    'comm': "比较两个排序文件。用法：comm <文件1> <文件2>",
+    'cp': "复制文件。用法：cp <源文件> <目标文件>",
+    'csplit': "根据模式分割文件。用法：csplit <文件> <模式> <前缀>",
+    'cut': "从文件中提取指定列。用法：cut -f <字段号> <文件>",
+    'date': "显示或设置系统日期和时间。用法：date",
+    'df': "显示磁盘空间使用情况。用法：df",
+    'diff': "比较文件差异。用法：diff <文件1> <文件2>",
+    'dirname': "返回文件路径的目录部分。用法：dirname <文件>",
+    'du': "显示目录或文件的磁盘使用情况。用法：du <路径>",
+    'echo': "输出文本到标准输出。用法：echo <内容>",
+    'env': "显示环境变量。用法：env",
+    'expand': "将制表符转换为空格。用法：expand <文件>",
+    'expr': "计算表达式。用法：expr <表达式>",
+    'factor': "分解数字。用法：factor <数字>",
+    'file': "确定文件类型。用法：file <文件>",
+    'find': "在文件系统中查找文件。用法：find <路径> <模式>",
+    'fmt': "简单文本格式化。用法：fmt <文件>",
+    'fold': "限制行宽度。用法：fold <文件> <宽度>",
+    'grep': "在文件中搜索文本模式。用法：grep <模式> <文件1> [<文件2> ...]",
+    'head': "显示文件的前几行。用法：head <文件>",
+    'hexdump': "以十六进制格式转储文件内容。用法：hexdump <文件>",
+    'history': "显示命令历史记录。用法：history [数量]",
+    'join': "根据指定字段连接文件。用法：join <文件1> <文件2> <字段号>",
+    'kill': "模拟终止进程。用法：kill <进程ID>",
+    'link': "创建硬链接。用法：link <源文件> <目标文件>",
+    'ln': "创建符号链接。用法：ln <目标> <链接名>",
+    'ls': "列出当前目录中的文件。用法：ls",
+    'man': "显示命令手册。用法：man <命令>",
+    'md5sum': "计算文件的MD5校验和。用法：md5sum <文件>",
+    'mime': "确定文件的MIME类型。用法：mime <文件>",
+    'mkdir': "创建一个新目录。用法：mkdir <目录>",
+    'mktemp': "创建临时文件或目录。用法：mktemp <模板>",
+    'mv': "移动或重命名文件。用法：mv <源文件> <目标文件>",
+    'nl': "为文件添加行号。用法：nl <文件>",
+    'numfmt': "格式化数字。用法：numfmt <格式字符串> <数字>",
+    'od': "转储文件内容。用法：od <文件>",
+    'paste': "合并文件。用法：paste <文件1> [<文件2> ...]",
+    'patch': "应用补丁文件。用法：patch <文件> <补丁文件>",
+    'pathchk': "检查文件名是否有效。用法：pathchk <文件>",
+    'pr': "格式化并打印文本文件。用法：pr <文件>",
+    'printf': "格式化输出文本。用法：printf <格式字符串> [值1] [值2] ...",
+    'ps': "模拟显示当前运行的进程。用法：ps",
+    'pwd': "显示当前工作目录。用法：pwd",
+    'readlink': "读取符号链接的内容。用法：readlink <符号链接>",
+    'realpath': "返回文件的绝对路径。用法：realpath <文件>",
+    'rev': "反转行。用法：rev <文件>",
+    'rm': "删除一个文件。用法：rm <文件>",
+    'rmdir': "删除一个空目录。用法：rmdir <目录>",
+    'sed': "流编辑器。用法：sed <模式> <替换> <文件>",
+    'seq': "生成序列。用法：seq <结束值> 或 seq <开始值> <结束值> 或 seq <开始值> <增量> <结束值>",
+    'sha1sum': "计算文件的SHA1校验和。用法：sha1sum <文件>",
+    'sha256sum': "计算文件的SHA256校验和。用法：sha256sum <文件>",
+    'shuf': "随机排列行。用法：shuf [-n <行数>] <文件>",
+    'sleep': "暂停执行一段时间。用法：sleep <秒数>",
+    'sort': "对文件内容进行排序。用法：sort <文件>",
+    'split': "分割文件。用法：split <文件> <前缀>",
+    'stat': "显示文件或文件系统状态。用法：stat <文件>",
+    'strings': "从文件中提取可打印字符串。用法：strings <文件>",
+    'sum': "计算文件的校验和。用法：sum <文件>",
+    'tac': "反向显示文件内容。用法：tac <文件>",
+    'tail': "显示文件的最后几行。用法：tail <文件>",
+    'test': "测试文件或字符串。用法：test <操作数1> <操作符> <操作数2>",
+    'time': "测量命令执行时间。用法：time <命令>",
+    'top': "模拟显示系统资源使用情况。用法：top",
+    'touch': "创建空文件或更新文件时间。用法：touch <文件>",
+    'tr': "转换或删除字符。用法：tr <集合1> <集合2> <文件>",
+    'truncate': "截断文件或扩展文件。用法：truncate <文件> <大小>",
+    'tsort': "拓扑排序。用法：tsort <文件>",
+    'ul': "下划线文本。用法：ul <文件>",
+    'unalias': "删除命令别名。用法：unalias <别名>",
+    'uname': "显示系统信息。用法：uname",
+    'unexpand': "将空格转换为制表符。用法：unexpand <文件>",
+    'uniq': "去除文件中的重复行。用法：uniq <文件>",
+    'unlink': "删除文件。用法：unlink <文件>",
+    'uptime': "显示系统运行时间。用法：uptime",
+    'watch': "周期性执行命令并显示输出。用法：watch <命令>",
+    'wc': "统计文件的行数、单词数和字符数。用法：wc [-l] <文件>",
+    'whereis': "查找命令的二进制文件、源代码和手册页的路径。用法：whereis <命令>",
+    'which': "查找命令的路径。用法：which <命令>",
+    'whoami': "显示当前用户的登录名。用法：whoami",
+    'yes': "输出字符串直到被中断。用法：yes <字符串>"
+}
+
+_HELP_KEYS = frozenset(_HELP_TEXT)
+_MAN_KEYS = frozenset(_MAN_PAGES)
 
 class Console:
     def __init__(self, file_system: FileSystem):
@@ -282,24 +1181,46 @@ class Console:
             'tac': self.tac,
             'tsort': self.tsort
         }
+        self._dispatch = self.commands.get
+        self._command_names = frozenset(self.commands)
         self.setup_autocomplete()
         self.setup_logging()
-        self.command_history = []
+        # 最多保留最近 _HISTORY_SIZE 条命令，更早的记录自动丢弃
+        self.command_history = deque(maxlen=_HISTORY_SIZE)
         self.aliases: Dict[str, str] = {}
         self.environment: Dict[str, str] = {}
         
         # 设置窗口标题
         self.set_window_title("GTOS 1.0")
+        if os.name == 'nt':
+            self._enable_vt_mode()
 
     def setup_autocomplete(self):
-        commands = list(self.commands.keys())
+        # 只有交互式终端才需要补全；输入来自管道时连 readline 也不必导入
+        if not sys.stdin.isatty():
+            return
+        try:
+            import readline
+        except ImportError:
+            import pyreadline3 as readline
+        commands = sorted(self.commands.keys())
         completer = self.create_completer(commands)
         readline.set_completer(completer)
         readline.parse_and_bind("tab: complete")
 
     def create_completer(self, commands: List[str]):
+        # commands 须已排序；readline 对同一前缀会以递增的 state 反复调用，缓存上次结果
+        last = ['', list(commands)]
+
         def custom_completer(text: str, state: int):
-            options = [cmd for cmd in commands if cmd.startswith(text)]
+            if text != last[0]:
+                options = []
+                for i in range(bisect.bisect_left(commands, text), len(commands)):
+                    if not commands[i].startswith(text):
+                        break
+                    options.append(commands[i])
+                last[0], last[1] = text, options
+            options = last[1]
             if state < len(options):
                 return options[state]
             else:
@@ -307,21 +1228,26 @@ class Console:
         return custom_completer
 
     def setup_logging(self):
-        if not os.path.exists('gtos.log'):
-            with open('gtos.log', 'w') as f:
-                pass
-        logging.basicConfig(
-            filename='gtos.log',
-            level=logging.DEBUG,
-            format='%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
+        # 日志记录先进入队列，由后台线程写文件，避免在交互循环中同步写盘
+        log_queue = queue.Queue(-1)
+        file_handler = logging.FileHandler('gtos.log', delay=True)
+        file_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        ))
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.DEBUG)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener.start()
+        atexit.register(listener.stop)
         logging.info("GTOS 启动")
 
     def run(self):
         try:
-            self.display_boot_screen()
-            os.system('cls' if os.name == 'nt' else 'clear')
+            animate = '--boot-anim' in sys.argv or os.environ.get('GTOS_BOOT_ANIM') == '1'
+            self.display_boot_screen(animate)
+            self._clear_screen()
             while True:
                 try:
                     command = input(f"{self.current_dir}$ ").strip()
@@ -343,7 +1269,7 @@ class Console:
         finally:
             logging.info("GTOS 关闭")
 
-    def display_boot_screen(self):
+    def display_boot_screen(self, animate: bool = False):
         boot_messages = [
             "Initializing GTOS...",
             "Loading kernel modules...",
@@ -354,27 +1280,44 @@ class Console:
             "Starting user interface...",
             "GTOS 1.0 - Developed by G.E. Studios"
         ]
-        
-        for message in boot_messages:
-            print(message)
-            time.sleep(0.5)
-        print("\n")
+
+        if animate:
+            for message in boot_messages:
+                print(message, flush=True)
+                time.sleep(0.05)
+            print("\n", flush=True)
+        else:
+            # 默认不做动画，一次写出全部启动信息
+            sys.stdout.write('\n'.join(boot_messages) + '\n\n\n')
+            sys.stdout.flush()
 
     def execute_command(self, command: str):
         try:
-            parts = command.split()
+            # 只切出命令名，参数部分留到最后再拆分一次
+            parts = command.split(None, 1)
             if not parts:
                 return
 
             cmd = parts[0].lower()
-            args = parts[1:]
+            rest = parts[1] if len(parts) > 1 else ''
 
+            # 迭代展开别名，限制层数以防别名互相引用导致无限展开
+            depth = 0
+            while cmd in self.aliases and depth < _MAX_ALIAS_DEPTH:
+                expansion = self.aliases[cmd].split(None, 1)
+                if not expansion:
+                    break
+                cmd = expansion[0].lower()
+                if len(expansion) > 1:
+                    rest = f"{expansion[1]} {rest}"
+                depth += 1
             if cmd in self.aliases:
-                command = self.aliases[cmd] + ' ' + ' '.join(args)
-                return self.execute_command(command)
+                print(f"别名 '{parts[0]}' 展开层数过多")
+                return
 
-            if cmd in self.commands:
-                self.commands[cmd](args)
+            handler = self._dispatch(cmd)
+            if handler:
+                handler(rest.split())
             else:
                 print(f"未找到命令 '{cmd}'")
         except Exception as e:
@@ -382,15 +1325,23 @@ class Console:
             print(error_message)
             logging.error(error_message, exc_info=True)
 
+    def _resolve(self, name: str) -> str:
+        # 参数相对于当前虚拟目录的路径；所有命令都经由这里解析路径
+        return _join_path(self.current_dir, name)
+
+    def _host_path(self, name: str) -> str:
+        # 自行 open 文件的命令需要宿主机上的路径：先按虚拟目录解析，再映射到 root_dir 之下
+        return self.file_system._full_path(self._resolve(name))
+
     def ls(self, args: List[str]):
-        files = self.file_system.list_dir(self.current_dir)
-        for file in files:
-            print(file)
+        for entry in self.file_system.list_dir(self.current_dir):
+            print(entry.name)
 
     def cd(self, args: List[str]):
         if args:
-            if self.file_system.change_dir(os.path.join(self.current_dir, args[0])):
-                self.current_dir = os.path.join(self.current_dir, args[0])
+            new_dir = posixpath.normpath(self._resolve(args[0]))
+            if self.file_system.change_dir(new_dir):
+                self.current_dir = new_dir
             else:
                 print("未找到目录")
         else:
@@ -398,7 +1349,7 @@ class Console:
 
     def mkdir(self, args: List[str]):
         if args:
-            if self.file_system.make_dir(os.path.join(self.current_dir, args[0])):
+            if self.file_system.make_dir(self._resolve(args[0])):
                 print(f"目录 '{args[0]}' 已创建")
             else:
                 print(f"无法创建目录 '{args[0]}'")
@@ -407,7 +1358,7 @@ class Console:
 
     def rm(self, args: List[str]):
         if args:
-            if self.file_system.remove_file(os.path.join(self.current_dir, args[0])):
+            if self.file_system.remove_file(self._resolve(args[0])):
                 print(f"文件 '{args[0]}' 已删除")
             else:
                 print(f"文件 '{args[0]}' 未找到或无法删除")
@@ -416,7 +1367,7 @@ class Console:
 
     def cp(self, args: List[str]):
         if len(args) == 2:
-            if self.file_system.copy_file(os.path.join(self.current_dir, args[0]), os.path.join(self.current_dir, args[1])):
+            if self.file_system.copy_file(self._resolve(args[0]), self._resolve(args[1])):
                 print(f"文件 '{args[0]}' 已复制到 '{args[1]}'")
             else:
                 print(f"无法将文件 '{args[0]}' 复制到 '{args[1]}'")
@@ -425,7 +1376,7 @@ class Console:
 
     def mv(self, args: List[str]):
         if len(args) == 2:
-            if self.file_system.move_file(os.path.join(self.current_dir, args[0]), os.path.join(self.current_dir, args[1])):
+            if self.file_system.move_file(self._resolve(args[0]), self._resolve(args[1])):
                 print(f"文件 '{args[0]}' 已移动到 '{args[1]}'")
             else:
                 print(f"无法将文件 '{args[0]}' 移动到 '{args[1]}'")
@@ -434,7 +1385,7 @@ class Console:
 
     def touch(self, args: List[str]):
         if args:
-            if self.file_system.create_file(os.path.join(self.current_dir, args[0])):
+            if self.file_system.create_file(self._resolve(args[0])):
                 print(f"文件 '{args[0]}' 已创建")
             else:
                 print(f"无法创建文件 '{args[0]}'")
@@ -443,7 +1394,7 @@ class Console:
 
     def cat(self, args: List[str]):
         if args:
-            content = self.file_system.read_file(os.path.join(self.current_dir, args[0]))
+            content = self.file_system.read_file(self._resolve(args[0]))
             if content:
                 print(content)
             else:
@@ -454,7 +1405,7 @@ class Console:
     def echo(self, args: List[str]):
         if args:
             content = ' '.join(args)
-            if self.file_system.write_file(os.path.join(self.current_dir, 'output.txt'), content):
+            if self.file_system.write_file(self._resolve('output.txt'), content):
                 print(f"内容已写入 'output.txt'")
             else:
                 print("无法写入文件")
@@ -466,7 +1417,7 @@ class Console:
 
     def rmdir(self, args: List[str]):
         if args:
-            if self.file_system.remove_dir(os.path.join(self.current_dir, args[0])):
+            if self.file_system.remove_dir(self._resolve(args[0])):
                 print(f"目录 '{args[0]}' 已删除")
             else:
                 print(f"无法删除目录 '{args[0]}'")
@@ -475,7 +1426,7 @@ class Console:
 
     def ln(self, args: List[str]):
         if len(args) == 2:
-            if self.file_system.create_symlink(os.path.join(self.current_dir, args[0]), os.path.join(self.current_dir, args[1])):
+            if self.file_system.create_symlink(self._resolve(args[0]), self._resolve(args[1])):
                 print(f"符号链接 '{args[1]}' 已创建，指向 '{args[0]}'")
             else:
                 print(f"无法创建符号链接 '{args[1]}'")
@@ -486,7 +1437,7 @@ class Console:
         if len(args) == 2:
             try:
                 mode = int(args[0], 8)
-                if self.file_system.change_mode(os.path.join(self.current_dir, args[1]), mode):
+                if self.file_system.change_mode(self._resolve(args[1]), mode):
                     print(f"文件 '{args[1]}' 的模式已更改为 {oct(mode)}")
                 else:
                     print(f"无法更改文件 '{args[1]}' 的模式")
@@ -500,7 +1451,7 @@ class Console:
             try:
                 uid = int(args[0])
                 gid = int(args[1])
-                if self.file_system.change_owner(os.path.join(self.current_dir, args[2]), uid, gid):
+                if self.file_system.change_owner(self._resolve(args[2]), uid, gid):
                     print(f"文件 '{args[2]}' 的所有者已更改为 UID {uid}，GID {gid}")
                 else:
                     print(f"无法更改文件 '{args[2]}' 的所有者")
@@ -514,13 +1465,13 @@ class Console:
 
     def du(self, args: List[str]):
         if args:
-            print(self.file_system.disk_usage(os.path.join(self.current_dir, args[0])))
+            print(self.file_system.disk_usage(self._resolve(args[0])))
         else:
             print("用法：du <路径>")
 
     def find(self, args: List[str]):
         if len(args) == 2:
-            results = self.file_system.find_files(self.current_dir, args[1])
+            results = self.file_system.find_files(self._resolve(args[0]), args[1])
             for result in results:
                 print(result)
         else:
@@ -528,7 +1479,7 @@ class Console:
 
     def grep(self, args: List[str]):
         if len(args) >= 2:
-            files = [os.path.join(self.current_dir, f) for f in args[1:]]
+            files = [self._resolve(f) for f in args[1:]]
             results = self.file_system.grep_files(args[0], files)
             for result in results:
                 print(result)
@@ -542,115 +1493,16 @@ class Console:
         print(os.getlogin())
 
     def help(self, args: List[str]):
-        help_text = {
-            'about': "显示关于GTOS的信息",
-            'alias': "创建命令别名",
-            'awk': "模式扫描和处理语言",
-            'basename': "返回文件路径的基本名称",
-            'bc': "基本计算器语言",
-            'cal': "显示日历",
-            'cat': "显示文件内容",
-            'cd': "更改当前工作目录",
-            'chmod': "更改文件模式",
-            'chown': "更改文件所有者",
-            'cksum': "计算文件的校验和",
-            'clear': "清除屏幕上的输出",
-            'cmp': "比较文件的字节",
-            'col': "过滤控制字符",
-            'colrm': "删除列",
-            'column': "格式化表格输出",
-            'comm': "比较两个排序文件",
-            'cp': "复制文件",
-            'csplit': "根据模式分割文件",
-            'cut': "从文件中提取指定列",
-            'date': "显示或设置系统日期和时间",
-            'df': "显示磁盘空间使用情况",
-            'diff': "比较文件差异",
-            'dirname': "返回文件路径的目录部分",
-            'du': "显示目录或文件的磁盘使用情况",
-            'echo': "输出文本到标准输出",
-            'env': "显示环境变量",
-            'expand': "将制表符转换为空格",
-            'expr': "计算表达式",
-            'factor': "分解数字",
-            'file': "确定文件类型",
-            'find': "在文件系统中查找文件",
-            'fmt': "简单文本格式化",
-            'fold': "限制行宽度",
-            'grep': "在文件中搜索文本模式",
-            'head': "显示文件的前几行",
-            'hexdump': "以十六进制格式转储文件内容",
-            'history': "显示命令历史记录",
-            'join': "根据指定字段连接文件",
-            'kill': "模拟终止进程",
-            'link': "创建硬链接",
-            'ln': "创建符号链接",
-            'ls': "列出当前目录中的文件",
-            'man': "显示命令手册",
-            'md5sum': "计算文件的MD5校验和",
-            'mime': "确定文件的MIME类型",
-            'mkdir': "创建一个新目录",
-            'mktemp': "创建临时文件或目录",
-            'mv': "移动或重命名文件",
-            'nl': "为文件添加行号",
-            'numfmt': "格式化数字",
-            'od': "转储文件内容",
-            'paste': "合并文件",
-            'patch': "应用补丁文件",
-            'pathchk': "检查文件名是否有效",
-            'pr': "格式化并打印文本文件",
-            'printf': "格式化输出文本",
-            'ps': "模拟显示当前运行的进程",
-            'pwd': "显示当前工作目录",
-            'readlink': "读取符号链接的内容",
-            'realpath': "返回文件的绝对路径",
-            'rev': "反转行",
-            'rm': "删除一个文件",
-            'rmdir': "删除一个空目录",
-            'sed': "流编辑器",
-            'seq': "生成序列",
-            'sha1sum': "计算文件的SHA1校验和",
-            'sha256sum': "计算文件的SHA256校验和",
-            'shuf': "随机排列行",
-            'sleep': "暂停执行一段时间",
-            'sort': "对文件内容进行排序",
-            'split': "分割文件",
-            'stat': "显示文件或文件系统状态",
-            'strings': "从文件中提取可打印字符串",
-            'sum': "计算文件的校验和",
-            'tac': "反向显示文件内容",
-            'tail': "显示文件的最后几行",
-            'test': "测试文件或字符串",
-            'time': "测量命令执行时间",
-            'top': "模拟显示系统资源使用情况",
-            'touch': "创建空文件或更新文件时间",
-            'tr': "转换或删除字符",
-            'truncate': "截断文件或扩展文件",
-            'tsort': "拓扑排序",
-            'ul': "下划线文本",
-            'unalias': "删除命令别名",
-            'uname': "显示系统信息",
-            'unexpand': "将空格转换为制表符",
-            'uniq': "去除文件中的重复行",
-            'unlink': "删除文件",
-            'uptime': "显示系统运行时间",
-            'watch': "周期性执行命令并显示输出",
-            'wc': "统计文件的行数、单词数和字符数",
-            'whereis': "查找命令的二进制文件、源代码和手册页的路径",
-            'which': "查找命令的路径",
-            'whoami': "显示当前用户的登录名",
-            'yes': "输出字符串直到被中断"
-        }
         if args:
             command = args[0].lower()
-            if command in help_text:
-                print(f"{command}: {help_text[command]}")
+            if command in _HELP_KEYS:
+                print(f"{command}: {_HELP_TEXT[command]}")
             else:
                 print(f"未找到命令 '{command}' 的帮助信息")
         else:
             print("可用命令：")
-            for cmd in sorted(help_text.keys()):
-                print(f"  {cmd}: {help_text[cmd]}")
+            for cmd, text in _HELP_TEXT.items():
+                print(f"  {cmd}: {text}")
 
     def about(self, args: List[str]):
         print("GTOS 版本信息：1.0")
@@ -659,8 +1511,9 @@ class Console:
     def history(self, args: List[str]):
         if args:
             try:
-                num = int(args[0])
-                for i, cmd in enumerate(self.command_history[-num:], start=len(self.command_history) - num + 1):
+                num = min(max(int(args[0]), 0), len(self.command_history))
+                start = len(self.command_history) - num
+                for i, cmd in enumerate(itertools.islice(self.command_history, start, None), start=start + 1):
                     print(f"{i}: {cmd}")
             except ValueError:
                 print("用法：history [数量]")
@@ -669,112 +1522,21 @@ class Console:
                 print(f"{i}: {cmd}")
 
     def clear(self, args: List[str]):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self._clear_screen()
+
+    def _clear_screen(self):
+        if os.environ.get('TERM') == 'dumb':
+            os.system('cls' if os.name == 'nt' else 'clear')
+            return
+        # 直接输出 ANSI 清屏序列，不再为此启动 shell 和 clear 进程
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
 
     def man(self, args: List[str]):
-        man_pages = {
-            'about': "显示关于GTOS的信息。用法：about",
-            'alias': "创建命令别名。用法：alias <别名> <命令>",
-            'awk': "模式扫描和处理语言。用法：awk '<脚本>' <文件>",
-            'basename': "返回文件路径的基本名称。用法：basename <文件>",
-            'bc': "基本计算器语言。用法：bc <表达式>",
-            'cal': "显示日历。用法：cal [年份]",
-            'cat': "显示文件内容。用法：cat <文件>",
-            'cd': "更改当前工作目录。用法：cd <目录>",
-            'chmod': "更改文件模式。用法：chmod <模式> <文件>",
-            'chown': "更改文件所有者。用法：chown <uid> <gid> <文件>",
-            'cksum': "计算文件的校验和。用法：cksum <文件>",
-            'clear': "清除屏幕上的输出。用法：clear",
-            'cmp': "比较文件的字节。用法：cmp <文件1> <文件2>",
-            'col': "过滤控制字符。用法：col <文件>",
-            'colrm': "删除列。用法：colrm <文件> <开始列> <结束列>",
-            'column': "格式化表格输出。用法：column <文件>",
-            'comm': "比较两个排序文件。用法：comm <文件1> <文件2>",
-            'cp': "复制文件。用法：cp <源文件> <目标文件>",
-            'csplit': "根据模式分割文件。用法：csplit <文件> <模式> <前缀>",
-            'cut': "从文件中提取指定列。用法：cut -f <字段号> <文件>",
-            'date': "显示或设置系统日期和时间。用法：date",
-            'df': "显示磁盘空间使用情况。用法：df",
-            'diff': "比较文件差异。用法：diff <文件1> <文件2>",
-            'dirname': "返回文件路径的目录部分。用法：dirname <文件>",
-            'du': "显示目录或文件的磁盘使用情况。用法：du <路径>",
-            'echo': "输出文本到标准输出。用法：echo <内容>",
-            'env': "显示环境变量。用法：env",
-            'expand': "将制表符转换为空格。用法：expand <文件>",
-            'expr': "计算表达式。用法：expr <表达式>",
-            'factor': "分解数字。用法：factor <数字>",
-            'file': "确定文件类型。用法：file <文件>",
-            'find': "在文件系统中查找文件。用法：find <路径> <模式>",
-            'fmt': "简单文本格式化。用法：fmt <文件>",
-            'fold': "限制行宽度。用法：fold <文件> <宽度>",
-            'grep': "在文件中搜索文本模式。用法：grep <模式> <文件1> [<文件2> ...]",
-            'head': "显示文件的前几行。用法：head <文件>",
-            'hexdump': "以十六进制格式转储文件内容。用法：hexdump <文件>",
-            'history': "显示命令历史记录。用法：history [数量]",
-            'join': "根据指定字段连接文件。用法：join <文件1> <文件2> <字段号>",
-            'kill': "模拟终止进程。用法：kill <进程ID>",
-            'link': "创建硬链接。用法：link <源文件> <目标文件>",
-            'ln': "创建符号链接。用法：ln <目标> <链接名>",
-            'ls': "列出当前目录中的文件。用法：ls",
-            'man': "显示命令手册。用法：man <命令>",
-            'md5sum': "计算文件的MD5校验和。用法：md5sum <文件>",
-            'mime': "确定文件的MIME类型。用法：mime <文件>",
-            'mkdir': "创建一个新目录。用法：mkdir <目录>",
-            'mktemp': "创建临时文件或目录。用法：mktemp <模板>",
-            'mv': "移动或重命名文件。用法：mv <源文件> <目标文件>",
-            'nl': "为文件添加行号。用法：nl <文件>",
-            'numfmt': "格式化数字。用法：numfmt <格式字符串> <数字>",
-            'od': "转储文件内容。用法：od <文件>",
-            'paste': "合并文件。用法：paste <文件1> [<文件2> ...]",
-            'patch': "应用补丁文件。用法：patch <文件> <补丁文件>",
-            'pathchk': "检查文件名是否有效。用法：pathchk <文件>",
-            'pr': "格式化并打印文本文件。用法：pr <文件>",
-            'printf': "格式化输出文本。用法：printf <格式字符串> [值1] [值2] ...",
-            'ps': "模拟显示当前运行的进程。用法：ps",
-            'pwd': "显示当前工作目录。用法：pwd",
-            'readlink': "读取符号链接的内容。用法：readlink <符号链接>",
-            'realpath': "返回文件的绝对路径。用法：realpath <文件>",
-            'rev': "反转行。用法：rev <文件>",
-            'rm': "删除一个文件。用法：rm <文件>",
-            'rmdir': "删除一个空目录。用法：rmdir <目录>",
-            'sed': "流编辑器。用法：sed <模式> <替换> <文件>",
-            'seq': "生成序列。用法：seq <结束值> 或 seq <开始值> <结束值> 或 seq <开始值> <增量> <结束值>",
-            'sha1sum': "计算文件的SHA1校验和。用法：sha1sum <文件>",
-            'sha256sum': "计算文件的SHA256校验和。用法：sha256sum <文件>",
-            'shuf': "随机排列行。用法：shuf <文件>",
-            'sleep': "暂停执行一段时间。用法：sleep <秒数>",
-            'sort': "对文件内容进行排序。用法：sort <文件>",
-            'split': "分割文件。用法：split <文件> <前缀>",
-            'stat': "显示文件或文件系统状态。用法：stat <文件>",
-            'strings': "从文件中提取可打印字符串。用法：strings <文件>",
-            'sum': "计算文件的校验和。用法：sum <文件>",
-            'tac': "反向显示文件内容。用法：tac <文件>",
-            'tail': "显示文件的最后几行。用法：tail <文件>",
-            'test': "测试文件或字符串。用法：test <操作数1> <操作符> <操作数2>",
-            'time': "测量命令执行时间。用法：time <命令>",
-            'top': "模拟显示系统资源使用情况。用法：top",
-            'touch': "创建空文件或更新文件时间。用法：touch <文件>",
-            'tr': "转换或删除字符。用法：tr <集合1> <集合2> <文件>",
-            'truncate': "截断文件或扩展文件。用法：truncate <文件> <大小>",
-            'tsort': "拓扑排序。用法：tsort <文件>",
-            'ul': "下划线文本。用法：ul <文件>",
-            'unalias': "删除命令别名。用法：unalias <别名>",
-            'uname': "显示系统信息。用法：uname",
-            'unexpand': "将空格转换为制表符。用法：unexpand <文件>",
-            'uniq': "去除文件中的重复行。用法：uniq <文件>",
-            'unlink': "删除文件。用法：unlink <文件>",
-            'uptime': "显示系统运行时间。用法：uptime",
-            'watch': "周期性执行命令并显示输出。用法：watch <命令>",
-            'wc': "统计文件的行数、单词数和字符数。用法：wc <文件>",
-            'whereis': "查找命令的二进制文件、源代码和手册页的路径。用法：whereis <命令>",
-            'which': "查找命令的路径。用法：which <命令>",
-            'whoami': "显示当前用户的登录名。用法：whoami",
-            'yes': "输出字符串直到被中断。用法：yes <字符串>"
-        }
         if args:
             command = args[0].lower()
-            if command in man_pages:
-                print(man_pages[command])
+            if command in _MAN_KEYS:
+                print(_MAN_PAGES[command])
             else:
                 print(f"未找到命令 '{command}' 的手册")
         else:
@@ -836,7 +1598,7 @@ class Console:
     def which(self, args: List[str]):
         if args:
             command = args[0]
-            if command in self.commands:
+            if command in self._command_names:
                 print(f"/usr/bin/{command}")
             else:
                 print(f"未找到命令 '{command}'")
@@ -846,7 +1608,7 @@ class Console:
     def whereis(self, args: List[str]):
         if args:
             command = args[0]
-            if command in self.commands:
+            if command in self._command_names:
                 print(f"{command}: /usr/bin/{command} /usr/src/{command} /usr/share/man/man1/{command}.1")
             else:
                 print(f"未找到命令 '{command}'")
@@ -857,12 +1619,12 @@ class Console:
         if args:
             try:
                 year = int(args[0])
-                print(calendar.calendar(year))
+                print(_year_cal(year))
             except ValueError:
                 print("用法：cal [年份]")
         else:
             now = datetime.datetime.now()
-            print(calendar.month(now.year, now.month))
+            print(_TC.formatmonth(now.year, now.month))
 
     def sleep(self, args: List[str]):
         if args:
@@ -883,28 +1645,28 @@ class Console:
         print(f"系统已运行 {uptime.days} 天 {uptime.seconds // 3600} 小时 {uptime.seconds // 60 % 60} 分钟")
 
     def wc(self, args: List[str]):
-        if args:
-            file_path = os.path.join(self.current_dir, args[0])
+        if len(args) == 2 and args[0] == '-l':
             try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                    lines = content.count('\n') + 1 if content else 0
-                    words = len(content.split())
-                    chars = len(content)
-                    print(f"{lines} {words} {chars} {args[0]}")
+                lines = self.file_system.count_lines(self._resolve(args[1]))
+                print(f"{lines} {args[1]}")
+            except OSError as e:
+                print(f"无法读取文件 '{args[1]}': {e}")
+        elif args:
+            try:
+                lines, words, chars = self.file_system.word_count(self._resolve(args[0]))
+                print(f"{lines} {words} {chars} {args[0]}")
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
-            print("用法：wc <文件>")
+            print("用法：wc [-l] <文件>")
 
     def sort(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    lines = sorted(f.readlines())
-                for line in lines:
-                    print(line.strip())
+                lines = self.file_system.read_lines(file_path)
+                lines.sort()
+                _write_lines(line.strip() for line in lines)
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -912,15 +1674,17 @@ class Console:
 
     def uniq(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-                unique_lines = []
+                lines = self.file_system.read_lines(file_path)
+                seen = set()
+                seen_add = seen.add
+                out = []
                 for line in lines:
-                    if line not in unique_lines:
-                        unique_lines.append(line)
-                        print(line.strip())
+                    if line not in seen:
+                        seen_add(line)
+                        out.append(line.strip())
+                _write_lines(out)
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -928,12 +1692,9 @@ class Console:
 
     def head(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-                for line in lines[:10]:
-                    print(line.strip())
+                _write_lines(line.strip() for line in self.file_system.read_lines(file_path, stop=10))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -941,12 +1702,9 @@ class Console:
 
     def tail(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-                for line in lines[-10:]:
-                    print(line.strip())
+                _write_lines(line.strip() for line in self.file_system.tail_lines(file_path, 10))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -954,17 +1712,21 @@ class Console:
 
     def cut(self, args: List[str]):
         if len(args) >= 2:
-            file_path = os.path.join(self.current_dir, args[-1])
-            try:
-                with open(file_path, 'r') as f:
+            file_path = self._resolve(args[-1])
+            try:
+                if args[0] != '-f':
+                    print("用法：cut -f <字段号> <文件>")
+                    return
+                field_index = int(args[1]) - 1
+                # 只切分到所需字段为止，剩余部分不再拆开
+                maxsplit = field_index + 1 if field_index >= 0 else -1
+                with self.file_system.open_text(file_path) as f:
+                    out = []
                     for line in f:
-                        fields = line.strip().split()
-                        if args[0] == '-f':
-                            field_index = int(args[1]) - 1
-                            if field_index < len(fields):
-                                print(fields[field_index])
-                        else:
-                            print("用法：cut -f <字段号> <文件>")
+                        fields = line.split(None, maxsplit)
+                        if field_index < len(fields):
+                            out.append(fields[field_index])
+                _write_lines(out)
             except OSError as e:
                 print(f"无法读取文件 '{args[-1]}': {e}")
         else:
@@ -972,21 +1734,11 @@ class Console:
 
     def paste(self, args: List[str]):
         if args:
-            files = [os.path.join(self.current_dir, f) for f in args]
-            try:
-                lines = [[] for _ in range(len(files))]
-                for i, file_path in enumerate(files):
-                    with open(file_path, 'r') as f:
-                        lines[i] = f.readlines()
-                max_lines = max(len(line_list) for line_list in lines)
-                for i in range(max_lines):
-                    row = []
-                    for j, line_list in enumerate(lines):
-                        if i < len(line_list):
-                            row.append(line_list[i].strip())
-                        else:
-                            row.append('')
-                    print('\t'.join(row))
+            files = [self._resolve(f) for f in args]
+            try:
+                lines = [self.file_system.read_lines(file_path) for file_path in files]
+                _write_lines('\t'.join(line.strip() for line in row)
+                             for row in itertools.zip_longest(*lines, fillvalue=''))
             except OSError as e:
                 print(f"无法读取文件：{e}")
         else:
@@ -996,7 +1748,7 @@ class Console:
         if len(args) == 3:
             set1, set2, file_path = args
             try:
-                with open(os.path.join(self.current_dir, file_path), 'r') as f:
+                with self.file_system.open_text(self._resolve(file_path)) as f:
                     content = f.read()
                 trans_table = str.maketrans(set1, set2)
                 print(content.translate(trans_table))
@@ -1009,7 +1761,7 @@ class Console:
         if len(args) == 3:
             pattern, replacement, file_path = args
             try:
-                with open(os.path.join(self.current_dir, file_path), 'r') as f:
+                with self.file_system.open_text(self._resolve(file_path)) as f:
                     content = f.read()
                 new_content = content.replace(pattern, replacement)
                 print(new_content)
@@ -1020,13 +1772,21 @@ class Console:
 
     def awk(self, args: List[str]):
         if len(args) >= 2:
-            script, file_path = args[0], os.path.join(self.current_dir, args[1])
+            script, file_path = args[0], self._resolve(args[1])
             try:
-                with open(file_path, 'r') as f:
+                # 脚本只编译一次；每行只更新命名空间中的变量
+                code = compile(script, '<awk>', 'eval')
+                ns: Dict[str, Any] = {}
+                with self.file_system.open_text(file_path) as f:
+                    out = []
                     for line in f:
-                        fields = line.strip().split()
-                        if eval(script):
-                            print(line.strip())
+                        fields = line.split()
+                        ns['line'] = line
+                        ns['fields'] = fields
+                        ns['NF'] = len(fields)
+                        if eval(code, ns):
+                            out.append(line.strip())
+                _write_lines(out)
             except OSError as e:
                 print(f"无法读取文件 '{args[1]}': {e}")
             except Exception as e:
@@ -1068,7 +1828,7 @@ class Console:
     def expr(self, args: List[str]):
         if args:
             try:
-                result = eval(' '.join(args))
+                result = eval(_compile_expr(' '.join(args)), {'__builtins__': {}}, {})
                 print(result)
             except Exception as e:
                 print(f"表达式计算错误：{e}")
@@ -1078,7 +1838,7 @@ class Console:
     def bc(self, args: List[str]):
         if args:
             try:
-                result = eval(' '.join(args))
+                result = eval(_compile_expr(' '.join(args)), {'__builtins__': {}}, {})
                 print(result)
             except Exception as e:
                 print(f"计算错误：{e}")
@@ -1112,13 +1872,15 @@ class Console:
 
     def yes(self, args: List[str]):
         if args:
-            while True:
-                try:
-                    print(args[0])
-                    time.sleep(0.1)
-                except KeyboardInterrupt:
-                    print("\nyes 已被用户中断。")
-                    break
+            # 预先拼好约 8 KiB 的输出块，每次 write 输出整块
+            line = args[0] + '\n'
+            block = line * max(1, 8192 // len(line))
+            write = sys.stdout.write
+            try:
+                while True:
+                    write(block)
+            except KeyboardInterrupt:
+                print("\nyes 已被用户中断。")
         else:
             print("用法：yes <字符串>")
 
@@ -1126,48 +1888,56 @@ class Console:
         if len(args) == 1:
             try:
                 end = int(args[0])
-                for i in range(1, end + 1):
-                    print(i)
+                _write_lines(map(str, range(1, end + 1)))
             except ValueError:
                 print("用法：seq <结束值>")
         elif len(args) == 2:
             try:
                 start, end = int(args[0]), int(args[1])
-                for i in range(start, end + 1):
-                    print(i)
+                _write_lines(map(str, range(start, end + 1)))
             except ValueError:
                 print("用法：seq <开始值> <结束值>")
         elif len(args) == 3:
             try:
                 start, increment, end = int(args[0]), int(args[1]), int(args[2])
-                for i in range(start, end + 1, increment):
-                    print(i)
+                _write_lines(map(str, range(start, end + 1, increment)))
             except ValueError:
                 print("用法：seq <开始值> <增量> <结束值>")
         else:
             print("用法：seq <结束值> 或 seq <开始值> <结束值> 或 seq <开始值> <增量> <结束值>")
 
     def shuf(self, args: List[str]):
-        if args:
-            file_path = os.path.join(self.current_dir, args[0])
+        count = None
+        if len(args) == 3 and args[0] == '-n':
             try:
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-                random.shuffle(lines)
-                for line in lines:
-                    print(line.strip())
+                count = int(args[1])
+            except ValueError:
+                args = []
+            args = args[2:]
+        if len(args) == 1:
+            file_path = self._resolve(args[0])
+            try:
+                if count is None:
+                    lines = self.file_system.read_lines(file_path)
+                    random.shuffle(lines)
+                else:
+                    # 只需要 count 行时按随机键保留最大的 count 行：流式读取，内存只占 count 行
+                    with self.file_system.open_text(file_path) as f:
+                        lines = heapq.nlargest(count, f, key=lambda _: random.random())
+                _write_lines(line.strip() for line in lines)
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
-            print("用法：shuf <文件>")
+            print("用法：shuf [-n <行数>] <文件>")
 
     def nl(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    for i, line in enumerate(f, start=1):
-                        print(f"{i}\t{line.strip()}")
+                # read_lines 只在 '\n' 处断行，'\f' 等字符留在行内
+                lines = self.file_system.read_lines(file_path)
+                if lines:
+                    print('\n'.join(f"{i}\t{line.strip()}" for i, line in enumerate(lines, start=1)))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1177,11 +1947,11 @@ class Console:
         if len(args) == 2:
             file_path, width = args[0], int(args[1])
             try:
-                with open(os.path.join(self.current_dir, file_path), 'r') as f:
-                    for line in f:
-                        while line:
-                            print(line[:width])
-                            line = line[width:]
+                folded = []
+                for line in self.file_system.read_lines(self._resolve(file_path)):
+                    folded.extend([line[i:i + width] for i in range(0, len(line), width)] or [''])
+                if folded:
+                    print('\n'.join(folded))
             except OSError as e:
                 print(f"无法读取文件 '{file_path}': {e}")
         else:
@@ -1189,11 +1959,12 @@ class Console:
 
     def expand(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    for line in f:
-                        print(line.expandtabs())
+                with self.file_system.open_text(file_path) as f:
+                    content = f.read()
+                # expandtabs 在换行处重置列号，可以直接处理整个文件
+                print(content.expandtabs(), end='' if content.endswith('\n') else '\n')
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1201,11 +1972,11 @@ class Console:
 
     def unexpand(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    for line in f:
-                        print(line.replace('    ', '\t'))
+                with self.file_system.open_text(file_path) as f:
+                    content = f.read()
+                print(content.replace('    ', '\t'), end='' if content.endswith('\n') else '\n')
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1214,16 +1985,20 @@ class Console:
     def join(self, args: List[str]):
         if len(args) == 3:
             file1, file2, field = args[0], args[1], int(args[2])
-            file1_path = os.path.join(self.current_dir, file1)
-            file2_path = os.path.join(self.current_dir, file2)
-            try:
-                with open(file1_path, 'r') as f1, open(file2_path, 'r') as f2:
-                    lines1 = [line.strip().split() for line in f1]
-                    lines2 = [line.strip().split() for line in f2]
-                    for line1 in lines1:
-                        for line2 in lines2:
-                            if line1[field - 1] == line2[field - 1]:
-                                print(' '.join(line1 + line2[field:]))
+            file1_path = self._resolve(file1)
+            file2_path = self._resolve(file2)
+            try:
+                lines1 = [line.strip().split() for line in self.file_system.read_lines(file1_path)]
+                lines2 = [line.strip().split() for line in self.file_system.read_lines(file2_path)]
+                # 先按连接字段为第二个文件建立索引，再单遍扫描第一个文件
+                index = {}
+                for line2 in lines2:
+                    if len(line2) >= field:
+                        index.setdefault(line2[field - 1], []).append(line2)
+                for line1 in lines1:
+                    if len(line1) >= field:
+                        for line2 in index.get(line1[field - 1], ()):
+                            print(' '.join(line1 + line2[field:]))
             except OSError as e:
                 print(f"无法读取文件：{e}")
         else:
@@ -1232,30 +2007,29 @@ class Console:
     def comm(self, args: List[str]):
         if len(args) == 2:
             file1, file2 = args[0], args[1]
-            file1_path = os.path.join(self.current_dir, file1)
-            file2_path = os.path.join(self.current_dir, file2)
-            try:
-                with open(file1_path, 'r') as f1, open(file2_path, 'r') as f2:
-                    lines1 = sorted(set(line.strip() for line in f1))
-                    lines2 = sorted(set(line.strip() for line in f2))
-                    i, j = 0, 0
-                    while i < len(lines1) and j < len(lines2):
-                        if lines1[i] < lines2[j]:
-                            print(f"< {lines1[i]}")
-                            i += 1
-                        elif lines1[i] > lines2[j]:
-                            print(f"> {lines2[j]}")
-                            j += 1
-                        else:
-                            print(f"  {lines1[i]}")
-                            i += 1
-                            j += 1
-                    while i < len(lines1):
+            file1_path = self._resolve(file1)
+            file2_path = self._resolve(file2)
+            try:
+                lines1 = sorted(set(line.strip() for line in self.file_system.read_lines(file1_path)))
+                lines2 = sorted(set(line.strip() for line in self.file_system.read_lines(file2_path)))
+                i, j = 0, 0
+                while i < len(lines1) and j < len(lines2):
+                    if lines1[i] < lines2[j]:
                         print(f"< {lines1[i]}")
                         i += 1
-                    while j < len(lines2):
+                    elif lines1[i] > lines2[j]:
                         print(f"> {lines2[j]}")
                         j += 1
+                    else:
+                        print(f"  {lines1[i]}")
+                        i += 1
+                        j += 1
+                while i < len(lines1):
+                    print(f"< {lines1[i]}")
+                    i += 1
+                while j < len(lines2):
+                    print(f"> {lines2[j]}")
+                    j += 1
             except OSError as e:
                 print(f"无法读取文件：{e}")
         else:
@@ -1264,26 +2038,13 @@ class Console:
     def diff(self, args: List[str]):
         if len(args) == 2:
             file1, file2 = args[0], args[1]
-            file1_path = os.path.join(self.current_dir, file1)
-            file2_path = os.path.join(self.current_dir, file2)
-            try:
-                with open(file1_path, 'r') as f1, open(file2_path, 'r') as f2:
-                    lines1 = f1.readlines()
-                    lines2 = f2.readlines()
-                    for i, (line1, line2) in enumerate(zip(lines1, lines2), start=1):
-                        if line1 != line2:
-                            print(f"{i}c{i}")
-                            print(f"< {line1.strip()}")
-                            print(f"---")
-                            print(f"> {line2.strip()}")
-                    if len(lines1) > len(lines2):
-                        for i in range(len(lines2) + 1, len(lines1) + 1):
-                            print(f"{i}a{i}")
-                            print(f"> {lines1[i - 1].strip()}")
-                    elif len(lines2) > len(lines1):
-                        for i in range(len(lines1) + 1, len(lines2) + 1):
-                            print(f"{i}d{i}")
-                            print(f"< {lines2[i - 1].strip()}")
+            file1_path = self._resolve(file1)
+            file2_path = self._resolve(file2)
+            try:
+                lines1 = self.file_system.read_lines(file1_path)
+                lines2 = self.file_system.read_lines(file2_path)
+                # 按最长公共子序列对齐，中间插入或删除的行不会导致后续各行全部错位
+                _write_lines(difflib.unified_diff(lines1, lines2, fromfile=file1, tofile=file2, lineterm=''))
             except OSError as e:
                 print(f"无法读取文件：{e}")
         else:
@@ -1292,23 +2053,37 @@ class Console:
     def patch(self, args: List[str]):
         if len(args) == 2:
             file_path, patch_path = args[0], args[1]
-            file_full_path = os.path.join(self.current_dir, file_path)
-            patch_full_path = os.path.join(self.current_dir, patch_path)
+            target = self._resolve(file_path)
             try:
-                with open(file_full_path, 'r') as f, open(patch_full_path, 'r') as p:
-                    file_content = f.read()
+                with self.file_system.open_text(target) as f, \
+                        self.file_system.open_text(self._resolve(patch_path)) as p:
+                    # 逐行迭代只在 '\n' 处断行，'\f' 等字符留在行内
+                    file_lines = f.readlines()
                     patch_content = p.read()
-                    new_content = file_content
-                    for line in patch_content.splitlines():
-                        if line.startswith('@@'):
-                            continue
-                        elif line.startswith('+'):
-                            new_content += line[1:] + '\n'
-                        elif line.startswith('-'):
-                            new_content = new_content.replace(line[1:] + '\n', '')
-                    with open(file_full_path, 'w') as f:
-                        f.write(new_content)
+                # 先收集要删除和追加的行，最后一次性拼接，避免反复复制整个文件内容
+                remove = set()
+                add = []
+                in_header = True
+                for line in patch_content.split('\n'):
+                    # 跳过 hunk 标记；统一格式 diff 的 '--- '/'+++ ' 文件头只出现在第一个 @@ 之前，
+                    # 之后同样前缀的行是删除或新增的正文（例如被删掉的 "-- sig"）
+                    if line.startswith('@@'):
+                        in_header = False
+                        continue
+                    elif in_header and line.startswith(('--- ', '+++ ')):
+                        continue
+                    elif line.startswith('+'):
+                        add.append(line[1:] + '\n')
+                    elif line.startswith('-'):
+                        remove.add(line[1:] + '\n')
+                # 原文件中被删除的行去掉后，新增行按补丁中的顺序追加到末尾；
+                # 统一格式 diff 中 '-' 行在 '+' 行之前，被移动的行先删后加，不能再被过滤掉
+                new_lines = [line for line in file_lines if line not in remove]
+                new_lines.extend(add)
+                if self.file_system.write_file(target, ''.join(new_lines)):
                     print(f"已应用补丁到 '{file_path}'")
+                else:
+                    print(f"无法写入文件 '{file_path}'")
             except OSError as e:
                 print(f"无法读取文件：{e}")
         else:
@@ -1317,24 +2092,27 @@ class Console:
     def cmp(self, args: List[str]):
         if len(args) == 2:
             file1, file2 = args[0], args[1]
-            file1_path = os.path.join(self.current_dir, file1)
-            file2_path = os.path.join(self.current_dir, file2)
+            file1_path = self._host_path(file1)
+            file2_path = self._host_path(file2)
             try:
                 with open(file1_path, 'rb') as f1, open(file2_path, 'rb') as f2:
-                    byte1 = f1.read(1)
-                    byte2 = f2.read(1)
-                    i = 0
-                    while byte1 and byte2:
-                        i += 1
-                        if byte1 != byte2:
+                    offset = 0
+                    while True:
+                        chunk1 = f1.read(_CMP_CHUNK)
+                        chunk2 = f2.read(_CMP_CHUNK)
+                        if chunk1 == chunk2:
+                            if not chunk1:
+                                print(f"文件 '{file1}' 和 '{file2}' 相同")
+                                break
+                            offset += len(chunk1)
+                            continue
+                        n = min(len(chunk1), len(chunk2))
+                        if chunk1[:n] == chunk2[:n]:
+                            print(f"文件 '{file1}' 和 '{file2}' 长度不同")
+                        else:
+                            i = offset + _first_difference(chunk1, chunk2, n) + 1
                             print(f"文件 '{file1}' 和 '{file2}' 在第 {i} 个字节处不同")
-                            return
-                        byte1 = f1.read(1)
-                        byte2 = f2.read(1)
-                    if byte1 or byte2:
-                        print(f"文件 '{file1}' 和 '{file2}' 长度不同")
-                    else:
-                        print(f"文件 '{file1}' 和 '{file2}' 相同")
+                        break
             except OSError as e:
                 print(f"无法读取文件：{e}")
         else:
@@ -1342,13 +2120,12 @@ class Console:
 
     def sum(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'rb') as f:
-                    checksum = 0
-                    for byte in f.read():
-                        checksum = (checksum + byte) & 0xFFFF
-                    print(f"{checksum} {os.path.getsize(file_path)} {args[0]}")
+                data = self.file_system.read_bytes(file_path)
+                # 逐字节累加后取低 16 位，等价于对总和取一次掩码；内置 sum 在 C 层完成累加
+                checksum = sum(data) & 0xFFFF
+                print(f"{checksum} {len(data)} {args[0]}")
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1356,14 +2133,10 @@ class Console:
 
     def cksum(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'rb') as f:
-                    crc = 0
-                    for byte in f.read():
-                        crc = (crc << 8) ^ crc32_table[(crc >> 24) ^ byte]
-                    crc = crc & 0xFFFFFFFF
-                    print(f"{crc} {os.path.getsize(file_path)} {args[0]}")
+                data = self.file_system.read_bytes(file_path)
+                print(f"{_posix_cksum(data)} {len(data)} {args[0]}")
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1371,13 +2144,10 @@ class Console:
 
     def md5sum(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'rb') as f:
-                    md5 = hashlib.md5()
-                    for chunk in iter(lambda: f.read(4096), b''):
-                        md5.update(chunk)
-                    print(f"{md5.hexdigest()}  {args[0]}")
+                digest = self.file_system.hash_file(file_path, 'md5')
+                print(f"{digest}  {args[0]}")
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1385,13 +2155,10 @@ class Console:
 
     def sha1sum(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'rb') as f:
-                    sha1 = hashlib.sha1()
-                    for chunk in iter(lambda: f.read(4096), b''):
-                        sha1.update(chunk)
-                    print(f"{sha1.hexdigest()}  {args[0]}")
+                digest = self.file_system.hash_file(file_path, 'sha1')
+                print(f"{digest}  {args[0]}")
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1399,13 +2166,10 @@ class Console:
 
     def sha256sum(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'rb') as f:
-                    sha256 = hashlib.sha256()
-                    for chunk in iter(lambda: f.read(4096), b''):
-                        sha256.update(chunk)
-                    print(f"{sha256.hexdigest()}  {args[0]}")
+                digest = self.file_system.hash_file(file_path, 'sha256')
+                print(f"{digest}  {args[0]}")
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1415,13 +2179,8 @@ class Console:
         if args:
             try:
                 number = int(args[0])
-                factors = []
-                for i in range(1, int(number**0.5) + 1):
-                    if number % i == 0:
-                        factors.append(i)
-                        if i != number // i:
-                            factors.append(number // i)
-                print(f"{number}: {' '.join(map(str, sorted(factors)))}")
+                factors = _divisors(number) if number > 0 else []
+                print(f"{number}: {' '.join(map(str, factors))}")
             except ValueError:
                 print("用法：factor <数字>")
         else:
@@ -1439,15 +2198,10 @@ class Console:
 
     def od(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'rb') as f:
-                    data = f.read()
-                    for i in range(0, len(data), 16):
-                        chunk = data[i:i+16]
-                        hex_chunk = ' '.join(f'{byte:02x}' for byte in chunk)
-                        ascii_chunk = ''.join(chr(byte) if 32 <= byte <= 126 else '.' for byte in chunk)
-                        print(f'{i:07o}: {hex_chunk:<48} {ascii_chunk}')
+                data = self.file_system.read_bytes(file_path)
+                _write_lines(_hex_rows(data, '{0:07o}: {1:<48} {2}'))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1455,15 +2209,10 @@ class Console:
 
     def hexdump(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'rb') as f:
-                    data = f.read()
-                    for i in range(0, len(data), 16):
-                        chunk = data[i:i+16]
-                        hex_chunk = ' '.join(f'{byte:02x}' for byte in chunk)
-                        ascii_chunk = ''.join(chr(byte) if 32 <= byte <= 126 else '.' for byte in chunk)
-                        print(f'{i:08x}  {hex_chunk:<48}  |{ascii_chunk}|')
+                data = self.file_system.read_bytes(file_path)
+                _write_lines(_hex_rows(data, '{0:08x}  {1:<48}  |{2}|'))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1471,20 +2220,10 @@ class Console:
 
     def strings(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'rb') as f:
-                    data = f.read()
-                    current_string = b''
-                    for byte in data:
-                        if 32 <= byte <= 126:
-                            current_string += bytes([byte])
-                        else:
-                            if len(current_string) >= 4:
-                                print(current_string.decode('ascii', errors='ignore'))
-                            current_string = b''
-                    if len(current_string) >= 4:
-                        print(current_string.decode('ascii', errors='ignore'))
+                data = self.file_system.read_bytes(file_path)
+                _write_lines(match.group().decode('ascii') for match in _STRINGS_RE.finditer(data))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1492,7 +2231,7 @@ class Console:
 
     def file(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._host_path(args[0])
             try:
                 with open(file_path, 'rb') as f:
                     data = f.read(1024)
@@ -1517,7 +2256,7 @@ class Console:
 
     def mime(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._host_path(args[0])
             try:
                 mime_type = mimetypes.guess_type(file_path)[0]
                 if mime_type:
@@ -1531,9 +2270,9 @@ class Console:
 
     def stat(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                stats = os.stat(file_path)
+                stats = self.file_system.stat(file_path)
                 print(f"文件: {args[0]}")
                 print(f"大小: {stats.st_size} 字节")
                 print(f"最后修改时间: {datetime.datetime.fromtimestamp(stats.st_mtime)}")
@@ -1551,7 +2290,7 @@ class Console:
         if args:
             template = args[0]
             try:
-                temp_file = tempfile.mkstemp(prefix=template)[1]
+                temp_file = self.file_system.make_temp(template)
                 print(f"临时文件创建成功: {temp_file}")
             except Exception as e:
                 print(f"创建临时文件失败: {e}")
@@ -1560,7 +2299,7 @@ class Console:
 
     def realpath(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._host_path(args[0])
             try:
                 print(os.path.realpath(file_path))
             except OSError as e:
@@ -1570,21 +2309,21 @@ class Console:
 
     def dirname(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             print(os.path.dirname(file_path))
         else:
             print("用法：dirname <文件>")
 
     def basename(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             print(os.path.basename(file_path))
         else:
             print("用法：basename <文件>")
 
     def pathchk(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
                 os.path.normpath(file_path)
                 print(f"文件名 '{args[0]}' 有效")
@@ -1595,9 +2334,9 @@ class Console:
 
     def readlink(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                print(os.readlink(file_path))
+                print(self.file_system.read_link(file_path))
             except OSError as e:
                 print(f"无法读取符号链接 '{args[0]}': {e}")
         else:
@@ -1606,51 +2345,49 @@ class Console:
     def link(self, args: List[str]):
         if len(args) == 2:
             src, dst = args[0], args[1]
-            src_path = os.path.join(self.current_dir, src)
-            dst_path = os.path.join(self.current_dir, dst)
-            try:
-                os.link(src_path, dst_path)
+            if self.file_system.create_hardlink(self._resolve(src), self._resolve(dst)):
                 print(f"硬链接 '{dst}' 已创建，指向 '{src}'")
-            except OSError as e:
-                print(f"无法创建硬链接 '{dst}' 指向 '{src}': {e}")
+            else:
+                print(f"无法创建硬链接 '{dst}' 指向 '{src}'")
         else:
             print("用法：link <源文件> <目标文件>")
 
     def unlink(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
-            try:
-                os.unlink(file_path)
+            if self.file_system.remove_file(self._resolve(args[0])):
                 print(f"文件 '{args[0]}' 已删除")
-            except OSError as e:
-                print(f"无法删除文件 '{args[0]}': {e}")
+            else:
+                print(f"无法删除文件 '{args[0]}'")
         else:
             print("用法：unlink <文件>")
 
     def truncate(self, args: List[str]):
         if len(args) == 2:
             file_path, size = args[0], int(args[1])
-            file_full_path = os.path.join(self.current_dir, file_path)
-            try:
-                with open(file_full_path, 'r+') as f:
-                    f.truncate(size)
+            if self.file_system.truncate_file(self._resolve(file_path), size):
                 print(f"文件 '{file_path}' 已截断至 {size} 字节")
-            except OSError as e:
-                print(f"无法截断文件 '{file_path}': {e}")
+            else:
+                print(f"无法截断文件 '{file_path}'")
         else:
             print("用法：truncate <文件> <大小>")
 
     def split(self, args: List[str]):
         if len(args) == 2:
             file_path, prefix = args[0], args[1]
-            file_full_path = os.path.join(self.current_dir, file_path)
+            file_full_path = self._host_path(file_path)
             try:
-                with open(file_full_path, 'r') as f:
-                    content = f.read()
-                chunk_size = 1024  # 1KB
-                for i, chunk in enumerate(range(0, len(content), chunk_size)):
-                    with open(os.path.join(self.current_dir, f"{prefix}{i:03d}"), 'w') as out:
-                        out.write(content[chunk:chunk + chunk_size])
+                chunk_size = 1 << 20  # 1MB
+                size = os.stat(file_full_path).st_size
+
+                def write_part(i: int, offset: int):
+                    # 每个分块各自打开源文件，互不共享文件位置，可以并行写出
+                    with open(file_full_path, 'rb') as f, \
+                            self.file_system.open_write(self._resolve(f"{prefix}{i:03d}")) as out:
+                        _copy_range(f, out, offset, chunk_size)
+
+                with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    # list() 取回每个结果，使工作线程中的 OSError 在这里抛出
+                    list(executor.map(write_part, itertools.count(), range(0, size, chunk_size)))
                 print(f"文件 '{file_path}' 已分割为 '{prefix}xxx' 文件")
             except OSError as e:
                 print(f"无法读取文件 '{file_path}': {e}")
@@ -1660,14 +2397,33 @@ class Console:
     def csplit(self, args: List[str]):
         if len(args) == 3:
             file_path, pattern, prefix = args[0], args[1], args[2]
-            file_full_path = os.path.join(self.current_dir, file_path)
-            try:
-                with open(file_full_path, 'r') as f:
-                    content = f.read()
-                parts = content.split(pattern)
-                for i, part in enumerate(parts):
-                    with open(os.path.join(self.current_dir, f"{prefix}{i:03d}"), 'w') as out:
-                        out.write(part)
+            file_full_path = self._host_path(file_path)
+            try:
+                sep = pattern.encode()
+                if not sep:
+                    print("csplit: 模式不能为空")
+                    return
+                part_path = lambda i: self._resolve(f"{prefix}{i:03d}")
+                # 按块流式读取；块尾可能是模式的前半部分，保留 len(sep) - 1 字节与下一块拼接后再判断
+                keep = len(sep) - 1
+                index = 0
+                buf = b''
+                with open(file_full_path, 'rb') as f:
+                    out = self.file_system.open_write(part_path(index))
+                    try:
+                        for block in iter(lambda: f.read(1 << 20), b''):
+                            *done, buf = (buf + block).split(sep)
+                            for part in done:
+                                out.write(part)
+                                out.close()
+                                index += 1
+                                out = self.file_system.open_write(part_path(index))
+                            if len(buf) > keep:
+                                out.write(buf[:len(buf) - keep])
+                                buf = buf[len(buf) - keep:]
+                        out.write(buf)
+                    finally:
+                        out.close()
                 print(f"文件 '{file_path}' 已根据模式 '{pattern}' 分割为 '{prefix}xxx' 文件")
             except OSError as e:
                 print(f"无法读取文件 '{file_path}': {e}")
@@ -1676,11 +2432,11 @@ class Console:
 
     def fmt(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                print(textwrap.fill(content, width=70))
+                # 逐行读取单词并流式填充，不需要把整个文件读入内存
+                with self.file_system.open_text(file_path) as f:
+                    _write_lines(_fill(itertools.chain.from_iterable(line.split() for line in f), 70))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1688,13 +2444,14 @@ class Console:
 
     def pr(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
-            try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                print(f"文件: {args[0]}")
-                print("-" * 72)
-                print(content)
+            file_path = self._resolve(args[0])
+            try:
+                with self.file_system.open_text(file_path) as f:
+                    print(f"文件: {args[0]}")
+                    print("-" * 72)
+                    # 分块复制到标准输出，不把整个文件读入内存
+                    shutil.copyfileobj(f, sys.stdout, 1 << 20)
+                    print()
                 print("-" * 72)
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
@@ -1703,11 +2460,10 @@ class Console:
 
     def ul(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    for line in f:
-                        print(line.replace('_', '\033[4m_\033[0m'))
+                with self.file_system.open_text(file_path) as f:
+                    _copy_text(f, lambda block: block.translate(_UL_TABLE))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1715,11 +2471,11 @@ class Console:
 
     def col(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    for line in f:
-                        print(line.replace('\t', '    '))
+                with self.file_system.open_text(file_path) as f:
+                    # 按 4 列制表位展开，而不是把每个制表符简单替换成 4 个空格
+                    _copy_text(f, lambda block: block.expandtabs(4), whole_lines=True)
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1728,11 +2484,9 @@ class Console:
     def colrm(self, args: List[str]):
         if len(args) == 3:
             file_path, start, end = args[0], int(args[1]), int(args[2])
-            file_full_path = os.path.join(self.current_dir, file_path)
             try:
-                with open(file_full_path, 'r') as f:
-                    for line in f:
-                        print(line[:start - 1] + line[end:])
+                first = start - 1
+                _write_lines(line[:first] + line[end:] for line in self.file_system.read_lines(self._resolve(file_path)))
             except OSError as e:
                 print(f"无法读取文件 '{file_path}': {e}")
         else:
@@ -1740,15 +2494,12 @@ class Console:
 
     def column(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._resolve(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    lines = [line.strip().split() for line in f]
-                if lines:
-                    max_widths = [max(len(row[i]) for row in lines) for i in range(len(lines[0]))]
-                    for row in lines:
-                        formatted_row = ' '.join(f"{cell:<{max_widths[i]}}" for i, cell in enumerate(row))
-                        print(formatted_row)
+                lines = [line.split() for line in self.file_system.read_lines(file_path)]
+                # 按列转置后用 max(map(len, ...)) 一次求出各列宽度，行的字段数可以不同
+                max_widths = [max(map(len, cells)) for cells in itertools.zip_longest(*lines, fillvalue='')]
+                _write_lines(' '.join(f"{cell:<{max_widths[i]}}" for i, cell in enumerate(row)) for row in lines)
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1756,11 +2507,11 @@ class Console:
 
     def rev(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._host_path(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    for line in f:
-                        print(line.strip()[::-1])
+                # 整块反转后各行顺序也颠倒了，再把行的顺序倒回来；全部在 C 层完成
+                _write_lines('\n'.join(_decode_lines(block)[::-1].split('\n')[::-1])
+                             for block in _line_blocks(_mmap_file(file_path)))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1768,12 +2519,11 @@ class Console:
 
     def tac(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
+            file_path = self._host_path(args[0])
             try:
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-                for line in reversed(lines):
-                    print(line.strip())
+                # 每块解码后在 C 层切分并倒序，不为每一行单独解码
+                _write_lines('\n'.join(_decode_lines(block).split('\n')[::-1])
+                             for block in _reverse_line_blocks(_mmap_file(file_path)))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
@@ -1781,40 +2531,59 @@ class Console:
 
     def tsort(self, args: List[str]):
         if args:
-            file_path = os.path.join(self.current_dir, args[0])
-            try:
-                with open(file_path, 'r') as f:
-                    edges = [line.strip().split() for line in f]
-                graph = {}
-                for u, v in edges:
-                    if u not in graph:
-                        graph[u] = set()
-                    if v not in graph:
-                        graph[v] = set()
-                    graph[u].add(v)
+            file_path = self._resolve(args[0])
+            try:
+                with self.file_system.open_text(file_path) as f:
+                    tokens = f.read().split()
+                if len(tokens) % 2:
+                    print(f"tsort: '{args[0]}' 包含奇数个标记")
+                    return
+                names, indptr, indices, indeg = _csr_graph(tokens)
+                # Kahn 算法：反复输出入度为 0 的节点，迭代实现，无递归深度限制
+                ready = deque(u for u, d in enumerate(indeg) if not d)
                 result = []
-                visited = set()
-                def dfs(node):
-                    if node in visited:
-                        return
-                    visited.add(node)
-                    for neighbor in graph.get(node, set()):
-                        dfs(neighbor)
-                    result.append(node)
-                for node in graph:
-                    dfs(node)
-                print(' '.join(reversed(result)))
+                while True:
+                    while ready:
+                        u = ready.popleft()
+                        result.append(u)
+                        for v in indices[indptr[u]:indptr[u + 1]]:
+                            if v < 0:
+                                continue
+                            indeg[v] -= 1
+                            if not indeg[v]:
+                                ready.append(v)
+                    # 还有节点未输出说明存在环：报告后从 CSR 中删去环上的一条边（槽位置为 -1）继续排序，
+                    # 保证所有节点都被输出，且同一个环不会被再次找到
+                    if len(result) == len(names):
+                        break
+                    cycle = _find_cycle(indptr, indices, indeg)
+                    if not cycle:
+                        break
+                    print(f"tsort: 输入中存在环：{' '.join(names[u] for u in cycle)}", file=sys.stderr)
+                    tail, head = cycle[-1], cycle[0]
+                    # 重复给出的同一条边要一并删去
+                    for k in range(indptr[tail], indptr[tail + 1]):
+                        if indices[k] == head:
+                            indices[k] = -1
+                            indeg[head] -= 1
+                    if not indeg[head]:
+                        ready.append(head)
+                print(' '.join(names[u] for u in result))
             except OSError as e:
                 print(f"无法读取文件 '{args[0]}': {e}")
         else:
             print("用法：tsort <文件>")
 
-    def set_window_title(self, title: str):
-        if os.name == 'nt':  # Windows
-            ctypes.windll.kernel32.SetConsoleTitleW(title)
-        elif os.name == 'posix':  # Unix/Linux/Mac
-            sys.stdout.write(f"\x1b]2;{title}\x07")
-            sys.stdout.flush()
+    def _enable_vt_mode(self):
+        # Windows 10 起控制台支持 ANSI 转义序列，但需要显式开启虚拟终端处理
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+
+    set_window_title = staticmethod(_set_title)
 
 if __name__ == "__main__":
     try:
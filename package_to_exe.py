@@ -3,10 +3,7 @@ import os
 
 def package_to_exe():
     try:
-        # 使用 PyInstaller 打包 console_app.py 为 .exe 文件
-        subprocess.run(["pyinstaller", "--onefile", "--name", "GTOS", "--version-file", "version_info.txt", "console_app.py"], check=True)
-        
-        # 创建 version_info.txt 文件
+        # 先创建 version_info.txt，PyInstaller 打包时需要读取它
         with open("version_info.txt", "w") as f:
             f.write("""FileVersion=1.0.0.0
 ProductVersion=1.0.0.0
@@ -16,8 +13,19 @@ OriginalFilename=GTOS.exe
 ProductName=GTOS
 """)
 
+        # 使用 PyInstaller 打包 console_app.py 为 .exe 文件
+        args = ["--onefile", "--name", "GTOS", "--version-file", "version_info.txt", "console_app.py"]
+        try:
+            import PyInstaller.__main__ as pyinstaller
+        except ImportError:
+            # 当前解释器中没有 PyInstaller 时退回调用命令行工具
+            subprocess.run(["pyinstaller", *args], check=True)
+        else:
+            # 在当前进程中直接运行，省去再启动一个 Python 解释器
+            pyinstaller.run(args)
+
         print("GTOS 已成功打包为 GTOS.exe，并包含了版权信息和版本号")
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, SystemExit) as e:
         print(f"打包过程中发生错误：{e}")
 
 if __name__ == "__main__":
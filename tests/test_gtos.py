@@ -0,0 +1,232 @@
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import unittest
+from typing import Tuple
+from unittest import mock
+
+# GTOS_1.0.py 的文件名含有点号，不能直接 import，按路径加载
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_spec = importlib.util.spec_from_file_location('gtos', os.path.join(_ROOT, 'GTOS_1.0.py'))
+gtos = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(gtos)
+
+
+class GTOSTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        # cd 会真正调用 os.chdir；先恢复工作目录再删除临时目录（Windows 上无法删除当前目录）
+        self.addCleanup(os.chdir, os.getcwd())
+        self.root = self._tmp.name
+        self.fs = gtos.FileSystem(self.root)
+        # 测试中不配置全局日志（不写 gtos.log），也不输出窗口标题转义序列
+        with mock.patch.object(gtos.Console, 'setup_logging'), contextlib.redirect_stdout(io.StringIO()):
+            self.console = gtos.Console(self.fs)
+
+    def write(self, name: str, data: bytes):
+        with open(os.path.join(self.root, name), 'wb') as f:
+            f.write(data)
+
+    def read(self, name: str) -> bytes:
+        with open(os.path.join(self.root, name), 'rb') as f:
+            return f.read()
+
+    def run_command(self, cmd: str, *args: str) -> str:
+        return self.run_command_full(cmd, *args)[0]
+
+    def run_command_full(self, cmd: str, *args: str) -> Tuple[str, str]:
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            self.console.commands[cmd](list(args))
+        return out.getvalue(), err.getvalue()
+
+
+class CopyFileTest(GTOSTestCase):
+    def test_copy_onto_itself_keeps_content(self):
+        self.write('a.txt', b'hello\n')
+        with self.assertLogs(level='ERROR'):
+            self.assertFalse(self.fs.copy_file('/a.txt', '/a.txt'))
+        self.assertEqual(self.read('a.txt'), b'hello\n')
+        with self.assertLogs(level='ERROR'):
+            self.assertIn('无法将文件', self.run_command('cp', 'a.txt', 'a.txt'))
+        self.assertEqual(self.read('a.txt'), b'hello\n')
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), '需要符号链接支持')
+    def test_copy_onto_symlink_to_source_keeps_content(self):
+        self.write('a.txt', b'hello\n')
+        os.symlink('a.txt', os.path.join(self.root, 'link.txt'))
+        with self.assertLogs(level='ERROR'):
+            self.assertFalse(self.fs.copy_file('/a.txt', '/link.txt'))
+        self.assertEqual(self.read('a.txt'), b'hello\n')
+
+    def test_copy_to_new_file(self):
+        self.write('a.txt', b'hello\n')
+        self.assertTrue(self.fs.copy_file('/a.txt', '/b.txt'))
+        self.assertEqual(self.read('b.txt'), b'hello\n')
+
+
+class PathTest(GTOSTestCase):
+    def test_relative_and_absolute_paths_agree_after_cd(self):
+        os.mkdir(os.path.join(self.root, 'sub'))
+        self.write(os.path.join('sub', 'x.txt'), b'b\na\n')
+        self.run_command('cd', 'sub')
+        self.assertEqual(self.run_command('pwd').strip(), '/sub')
+        # cat 走 FileSystem 方法，sort 自行打开文件：两类命令解析出的是同一个文件
+        self.assertIn('b\na', self.run_command('cat', 'x.txt'))
+        self.assertEqual(self.run_command('sort', 'x.txt'), 'a\nb\n')
+        self.assertEqual(self.run_command('sort', '/sub/x.txt'), 'a\nb\n')
+        self.run_command('cd', '..')
+        self.assertEqual(self.run_command('pwd').strip(), '/')
+        self.assertEqual(self.run_command('sort', 'sub/x.txt'), 'a\nb\n')
+
+    def test_find_searches_the_given_path(self):
+        os.mkdir(os.path.join(self.root, 'sub'))
+        self.write('top.txt', b'')
+        self.write(os.path.join('sub', 'x.txt'), b'')
+        found = self.run_command('find', 'sub', '*.txt').splitlines()
+        self.assertEqual(found, [os.path.join(self.root, 'sub', 'x.txt')])
+
+
+class SplitTest(GTOSTestCase):
+    def split_and_join(self, data: bytes) -> bytes:
+        self.write('s', data)
+        self.run_command('split', 's', 'p')
+        parts = sorted(name for name in os.listdir(self.root) if name.startswith('p'))
+        return b''.join(self.read(name) for name in parts)
+
+    def test_split_round_trips(self):
+        data = os.urandom((1 << 20) * 2 + 123)
+        self.assertEqual(self.split_and_join(data), data)
+
+    def test_split_without_sendfile(self):
+        # 非 Linux 平台（如 macOS）不使用 sendfile，走用户态复制
+        data = os.urandom((1 << 20) + 7)
+        with mock.patch.object(gtos, '_USE_SENDFILE', False):
+            self.assertEqual(self.split_and_join(data), data)
+
+
+class MetaCacheTest(GTOSTestCase):
+    # 修改文件的命令都要清除元数据缓存，紧接着的 stat 不能看到旧结果
+    def test_stat_after_truncate(self):
+        self.write('t', b'hello world')
+        self.assertIn('大小: 11 字节', self.run_command('stat', 't'))
+        self.run_command('truncate', 't', '2')
+        self.assertIn('大小: 2 字节', self.run_command('stat', 't'))
+
+    def test_stat_after_unlink(self):
+        self.write('t', b'x')
+        self.assertIn('大小: 1 字节', self.run_command('stat', 't'))
+        self.run_command('unlink', 't')
+        self.assertIn('无法读取文件', self.run_command('stat', 't'))
+
+    def test_stat_after_link(self):
+        self.write('x', b'abc')
+        self.assertIn('无法读取文件', self.run_command('stat', 'y'))
+        self.run_command('link', 'x', 'y')
+        self.assertIn('大小: 3 字节', self.run_command('stat', 'y'))
+
+    def test_stat_after_split(self):
+        self.write('s', b'abc')
+        self.assertIn('无法读取文件', self.run_command('stat', 'p000'))
+        self.run_command('split', 's', 'p')
+        self.assertIn('大小: 3 字节', self.run_command('stat', 'p000'))
+
+
+class TextReadTest(GTOSTestCase):
+    def test_text_commands_share_one_decoding_policy(self):
+        # 无法解码的字节替换为 U+FFFD，'\r\n' 按换行处理，各命令结果一致
+        self.write('t.txt', b'b\r\na\xff\r\n')
+        self.assertEqual(self.run_command('sort', 't.txt'), 'a\ufffd\nb\n')
+        self.assertEqual(self.run_command('head', 't.txt'), 'b\na\ufffd\n')
+        self.assertEqual(self.run_command('tail', 't.txt'), 'b\na\ufffd\n')
+        self.assertEqual(self.run_command('nl', 't.txt'), '1\tb\n2\ta\ufffd\n')
+
+    def test_only_newline_ends_a_line(self):
+        # '\f'、'\x1d' 等字符是行内容的一部分，不是行分隔符
+        self.write('t.txt', b'c\x1dd\na\x0cb\n')
+        self.assertEqual(self.run_command('sort', 't.txt'), 'a\x0cb\nc\x1dd\n')
+        for cmd in ('uniq', 'head', 'tail', 'paste'):
+            self.assertEqual(self.run_command(cmd, 't.txt'), 'c\x1dd\na\x0cb\n', cmd)
+        self.assertEqual(self.run_command('nl', 't.txt'), '1\tc\x1dd\n2\ta\x0cb\n')
+        self.assertEqual(self.run_command('fold', 't.txt', '2'), 'c\x1d\nd\na\x0c\nb\n')
+
+
+class ReverseTest(GTOSTestCase):
+    def test_rev_strips_only_the_line_ending(self):
+        self.write('r.txt', b'abc\r\n  de \r\n')
+        self.assertEqual(self.run_command('rev', 'r.txt'), 'cba\n ed  \n')
+
+    def test_tac_strips_carriage_returns(self):
+        self.write('r.txt', b'abc\r\nde\r\n')
+        self.assertEqual(self.run_command('tac', 'r.txt'), 'de\nabc\n')
+
+
+class TsortTest(GTOSTestCase):
+    def tsort(self, data: bytes) -> Tuple[str, list]:
+        self.write('deps.txt', data)
+        out, err = self.run_command_full('tsort', 'deps.txt')
+        return out.strip(), err.splitlines()
+
+    def test_acyclic(self):
+        out, cycles = self.tsort(b'a b\nb c\na c\n')
+        self.assertEqual(out, 'a b c')
+        self.assertEqual(cycles, [])
+
+    def test_single_cycle(self):
+        out, cycles = self.tsort(b'a b\nb c\nc a\n')
+        self.assertEqual(out, 'a b c')
+        self.assertEqual(cycles, ['tsort: 输入中存在环：a b c'])
+
+    def test_two_cycles_joined_by_edge(self):
+        # d -> a 把两个环连起来：每个环只报告一次，且 d 必须排在 a 之前
+        out, cycles = self.tsort(b'a b\nb a\nc d\nd c\nd a\n')
+        self.assertEqual(out, 'c d a b')
+        self.assertEqual(cycles, ['tsort: 输入中存在环：a b', 'tsort: 输入中存在环：c d'])
+
+    def test_repeated_cycle_edge_reported_once(self):
+        out, cycles = self.tsort(b'a b\nb a\nb a\n')
+        self.assertEqual(out, 'a b')
+        self.assertEqual(cycles, ['tsort: 输入中存在环：a b'])
+
+    def test_self_pair_is_not_a_cycle(self):
+        out, cycles = self.tsort(b'a a\n')
+        self.assertEqual(out, 'a')
+        self.assertEqual(cycles, [])
+        out, cycles = self.tsort(b'b b\na b\n')
+        self.assertEqual(out, 'a b')
+        self.assertEqual(cycles, [])
+
+
+class PatchTest(GTOSTestCase):
+    def test_diff_output_round_trips(self):
+        self.write('a.txt', b'body\n-- sig\n++ plus\n')
+        self.write('b.txt', b'body\n+++ new\n')
+        self.write('p.diff', self.run_command('diff', 'a.txt', 'b.txt').encode())
+        self.run_command('patch', 'a.txt', 'p.diff')
+        self.assertEqual(self.read('a.txt'), b'body\n+++ new\n')
+
+    def test_headerless_patch(self):
+        self.write('a.txt', b'one\ntwo\n')
+        self.write('p.diff', b'-one\n+three\n')
+        self.run_command('patch', 'a.txt', 'p.diff')
+        self.assertEqual(self.read('a.txt'), b'two\nthree\n')
+
+    def test_moved_line_is_added_back(self):
+        self.write('a.txt', b'a\nb\nc\n')
+        self.write('p.diff', b'@@ -1,3 +1,3 @@\n-a\n b\n c\n+a\n')
+        self.run_command('patch', 'a.txt', 'p.diff')
+        self.assertEqual(self.read('a.txt'), b'b\nc\na\n')
+
+    def test_form_feed_stays_inside_the_line(self):
+        self.write('a.txt', b'a\x0cb\nc\n')
+        self.write('p.diff', b'-a\x0cb\n')
+        self.run_command('patch', 'a.txt', 'p.diff')
+        self.assertEqual(self.read('a.txt'), b'c\n')
+
+
+if __name__ == '__main__':
+    unittest.main()